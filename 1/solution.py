@@ -3,19 +3,71 @@ Solution to the first problem, calculating the number of times that the depth
 increases.
 
 """
+import sys
+from array import array
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial, reduce
+from itertools import islice, tee
+from operator import gt
 from os import PathLike
 from pathlib import Path
-from typing import List, Iterator, Iterable, Sequence, Tuple, TypeVar
+from typing import (
+    Dict,
+    List,
+    Iterator,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+sys.path.append(str(Path(__file__).absolute().parents[1]))
+from aoc.fast_input import (  # pylint: disable=wrong-import-position
+    IntArray,
+    read_line_ints,
+    split_lines,
+)
+from aoc.instrument import instrument, phase  # pylint: disable=wrong-import-position
 
 IterType = TypeVar("IterType")
 ROOT = Path(__file__).absolute().parent
 
+Reading = Union[int, str, bytes]
+"""A depth reading, either as an integer or as a line from an input file."""
 
-def parse_input(path: PathLike) -> List[int]:
-    """Parse the list of depths from the file."""
-    with open(path, "r") as file:
-        return list(map(int, file))
+
+class IncreaseSummary(NamedTuple):
+    """
+    A summary of the increases within a contiguous run of readings, with the
+    readings at either end which can form windows with neighbouring runs.
+
+    """
+
+    count: int
+    """The number of increases between windows entirely within the run."""
+    head: Tuple[int, ...]
+    """The first `window` readings in the run (or all of them, if fewer)."""
+    tail: Tuple[int, ...]
+    """The last `window` readings in the run (or all of them, if fewer)."""
+
+
+def parse_input(path: PathLike, compact: bool = False) -> Union[List[int], IntArray]:
+    """
+    Parse the list of depths from the file. If `compact` is True, return the
+    depths as an `array` of integers rather than a list.
+
+    """
+    depths = read_line_ints(path)
+    return depths if compact else depths.tolist()
 
 
 def iterate_window(
@@ -38,6 +90,7 @@ def iterate_window(
         items.popleft()
 
 
+@instrument
 def count_increases_pairwise(readings: Sequence[int]) -> int:
     """Count the number of times a reading increases."""
     counter = 0
@@ -49,6 +102,7 @@ def count_increases_pairwise(readings: Sequence[int]) -> int:
     return counter
 
 
+@instrument
 def count_increases_window(readings: Sequence[int]) -> int:
     """Count the number of times the sum of a three-item window increases."""
     counter = 0
@@ -60,13 +114,137 @@ def count_increases_window(readings: Sequence[int]) -> int:
     return counter
 
 
-def main():
+@instrument
+def count_increases_streaming(readings: Iterable[Reading], window: int = 1) -> int:
+    """
+    Count the number of times the sum of a `window`-item window increases, in a
+    single pass over the readings. With the default `window` of 1, this counts
+    pairwise increases.
+
+    Readings can be any iterable, including an open input file (or other stream
+    of lines) which would not fit in memory. Consecutive windows share all but
+    one reading, so the running sum increases exactly when the reading entering
+    the window is greater than the one leaving it. Only the last `window`
+    readings are held in memory at a time, and no sums are calculated.
+
+    """
+    if window < 1:
+        raise ValueError("`window` must be at least 1")
+
+    leaving, entering = tee(map(int, readings))
+    # Advance the leading iterator; `tee` buffers only the readings in between.
+    next(islice(entering, window - 1, window), None)
+    return sum(map(gt, entering, leaving))
+
+
+@instrument
+def count_increases_sweep(
+    readings: Sequence[int], windows: Iterable[int]
+) -> Dict[int, int]:
+    """
+    Count the number of times the sum of the sliding window increases, for each
+    of a number of window sizes, returning a mapping from window size to count.
+
+    As in `count_increases_streaming`, the sum increases when the reading
+    entering the window is greater than the one leaving it, so each window size
+    is a single comparison of the readings with themselves, offset by the size.
+    The readings are loaded once as an int64 array and compared with NumPy
+    where it is available (an `array` from `parse_input(path, compact=True)` is
+    used without copying).
+
+    """
+    windows = list(windows)
+    if any(window < 1 for window in windows):
+        raise ValueError("Window sizes must be at least 1")
+
+    if np is None:
+        return {
+            window: sum(map(gt, islice(readings, window, None), readings))
+            for window in windows
+        }
+
+    if isinstance(readings, array) and readings.typecode == "q":
+        values = np.frombuffer(readings, dtype=np.int64)
+    else:
+        values = np.asarray(readings, dtype=np.int64)
+
+    return {
+        window: int(np.count_nonzero(values[window:] > values[:-window]))
+        for window in windows
+    }
+
+
+def summarise_increases(readings: Sequence[int], window: int = 1) -> IncreaseSummary:
+    """Summarise the increases within a contiguous run of readings."""
+    count = count_increases_streaming(readings, window)
+    return IncreaseSummary(count, tuple(readings[:window]), tuple(readings[-window:]))
+
+
+def combine_summaries(
+    left: IncreaseSummary, right: IncreaseSummary, window: int = 1
+) -> IncreaseSummary:
+    """
+    Combine the summaries of two adjacent runs of readings, counting the
+    increases between windows which cross the boundary between them.
+
+    """
+    boundary = left.tail + right.head
+    n_left = len(left.tail)
+    n_crossing = sum(
+        map(gt, islice(boundary, window, n_left + window), boundary[:n_left])
+    )
+
+    return IncreaseSummary(
+        left.count + right.count + n_crossing,
+        (left.head + right.head)[:window],
+        (left.tail + right.tail)[-window:],
+    )
+
+
+def _summarise_chunk(path: PathLike, window: int, byte_range: Tuple[int, int]):
+    """Summarise the increases within a range of bytes of an input file."""
+    return summarise_increases(read_line_ints(path, *byte_range), window)
+
+
+@instrument
+def count_increases_parallel(
+    path: PathLike,
+    window: int = 1,
+    max_workers: Optional[int] = None,
+    chunk_size: int = 2 ** 26,
+) -> int:
+    """
+    Count the number of times the sum of a `window`-item window increases in a
+    (very large) input file, using a pool of `max_workers` processes.
+
+    The file is split into chunks of roughly `chunk_size` bytes, each starting
+    on a new line, which are counted independently. The results are combined in
+    order, including the windows which cross the boundaries between chunks.
+
+    """
+    if window < 1:
+        raise ValueError("`window` must be at least 1")
+
+    empty = IncreaseSummary(0, (), ())
+    summarise = partial(_summarise_chunk, path, window)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        summaries = executor.map(summarise, split_lines(path, chunk_size))
+        total = reduce(partial(combine_summaries, window=window), summaries, empty)
+
+    return total.count
+
+
+def main(path: PathLike = ROOT.joinpath("data", "input_1.txt")):
     """Read in the data and count the number of increases."""
-    input_list = parse_input(ROOT.joinpath("data", "input_1.txt"))
+    with phase("parse") as parsing:
+        input_list = parse_input(path)
+        parsing.add_items(len(input_list))
 
-    pairwise_increases = count_increases_pairwise(input_list)
+    with phase("part_1", items=len(input_list)):
+        pairwise_increases = count_increases_pairwise(input_list)
     print(f"Depth increased {pairwise_increases} times pairwise.")
-    window_increases = count_increases_window(input_list)
+    with phase("part_2", items=len(input_list)):
+        window_increases = count_increases_window(input_list)
     print(f"Depth increased {window_increases} times in sliding window.")
 
 
@@ -1,7 +1,19 @@
 """Tests using AOC-provided example data."""
 from pathlib import Path
 
-from solution import parse_input, count_increases_pairwise, count_increases_window
+import pytest
+
+import solution
+from solution import (
+    parse_input,
+    count_increases_pairwise,
+    count_increases_window,
+    count_increases_streaming,
+    count_increases_sweep,
+    count_increases_parallel,
+    combine_summaries,
+    summarise_increases,
+)
 
 
 ROOT = Path(__file__).absolute().parent
@@ -17,3 +29,73 @@ def test_window_count():
     """Test that the sliding window implementation works on the test data."""
     input_list = parse_input(ROOT.joinpath("data", "test_input_1.txt"))
     assert count_increases_window(input_list) == 5
+
+
+@pytest.mark.parametrize("window,expected", [(1, 7), (3, 5), (9, 1), (10, 0), (20, 0)])
+def test_streaming_count(window: int, expected: int):
+    """
+    Test that the streaming implementation works on the test data, read
+    directly from the file.
+
+    """
+    with open(ROOT.joinpath("data", "test_input_1.txt"), "r") as file:
+        assert count_increases_streaming(file, window) == expected
+
+
+def test_streaming_count_matches_window():
+    """Test that the streaming implementation matches for the sliding window."""
+    input_list = parse_input(ROOT.joinpath("data", "input_1.txt"))
+    assert count_increases_streaming(iter(input_list), 3) == count_increases_window(
+        input_list
+    )
+    assert count_increases_streaming(input_list) == count_increases_pairwise(input_list)
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+@pytest.mark.parametrize("compact", [True, False])
+def test_sweep_count(monkeypatch, use_numpy: bool, compact: bool):
+    """
+    Test that the window size sweep matches the streaming implementation,
+    with and without NumPy.
+
+    """
+    if use_numpy and solution.np is None:
+        pytest.skip("NumPy is not installed.")
+    if not use_numpy:
+        monkeypatch.setattr(solution, "np", None)
+
+    readings = parse_input(ROOT.joinpath("data", "input_1.txt"), compact=compact)
+    windows = [1, 2, 3, 50, 1999, 2000, 2500]
+    expected = {
+        window: count_increases_streaming(readings, window) for window in windows
+    }
+    assert count_increases_sweep(readings, windows) == expected
+
+
+@pytest.mark.parametrize("window", [1, 3, 25])
+def test_combine_summaries(window: int):
+    """
+    Test that combining summaries counts windows crossing the boundaries,
+    including where runs are shorter than the window.
+
+    """
+    readings = parse_input(ROOT.joinpath("data", "input_1.txt"))[:300]
+    boundaries = [0, 7, 8, 30, 31, 31, 150, 300]
+    summaries = [
+        summarise_increases(readings[start:end], window)
+        for start, end in zip(boundaries, boundaries[1:])
+    ]
+
+    combined = summaries[0]
+    for summary in summaries[1:]:
+        combined = combine_summaries(combined, summary, window)
+    assert combined == summarise_increases(readings, window)
+
+
+@pytest.mark.parametrize("window", [1, 3, 25])
+def test_parallel_count(window: int):
+    """Test that counting increases in chunks of the file in parallel works."""
+    path = ROOT.joinpath("data", "input_1.txt")
+    expected = count_increases_streaming(parse_input(path), window)
+    count = count_increases_parallel(path, window, max_workers=2, chunk_size=64)
+    assert count == expected
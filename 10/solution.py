@@ -2,11 +2,15 @@
 Solution to the tenth challenge, fixing syntax errors.
 
 """
+import sys
 from collections import deque
 from os import PathLike
 from pathlib import Path
 from typing import Deque, Iterable, List, Optional, Tuple
 
+sys.path.append(str(Path(__file__).absolute().parents[1]))
+from aoc.instrument import instrument, phase  # pylint: disable=wrong-import-position
+
 ROOT = Path(__file__).absolute().parent
 
 
@@ -54,6 +58,7 @@ def parse_input(path: PathLike) -> List[str]:
         return list(map(str.rstrip, file))
 
 
+@instrument
 def identify_bracket_errors(
     string: str,
 ) -> Tuple[Optional[Mismatch], Optional[Completion]]:
@@ -78,6 +83,7 @@ def identify_bracket_errors(
     return None, None
 
 
+@instrument
 def score_mismatches(mismatches: Iterable[Mismatch]) -> int:
     """
     Score a collection of mismatched brackets, according to the rules for
@@ -87,6 +93,7 @@ def score_mismatches(mismatches: Iterable[Mismatch]) -> int:
     return sum(map(BRACKET_SYNTAX_SCORES.__getitem__, mismatches))
 
 
+@instrument
 def score_completions(completions: Iterable[Completion]) -> int:
     """
     Score a list of completions, according to the rules for auto-formatters
@@ -105,15 +112,19 @@ def score_completions(completions: Iterable[Completion]) -> int:
     return scores[len(scores) // 2]
 
 
-def main():
+def main(path: PathLike = ROOT.joinpath("data", "input_1.txt")):
     """Parse the erroneous brackets."""
-    strings = parse_input(ROOT.joinpath("data", "input_1.txt"))
-    mismatches, completions = zip(*map(identify_bracket_errors, strings))
+    with phase("parse") as parsing:
+        strings = parse_input(path)
+        parsing.add_items(len(strings))
 
-    syntax_score = score_mismatches(filter(None, mismatches))
+    with phase("part_1", items=len(strings)):
+        mismatches, completions = zip(*map(identify_bracket_errors, strings))
+        syntax_score = score_mismatches(filter(None, mismatches))
     print(f"Syntax error score is {syntax_score}.")
 
-    completion_score = score_completions(filter(None, completions))
+    with phase("part_2"):
+        completion_score = score_completions(filter(None, completions))
     print(f"Completion score is {completion_score}.")
 
 
@@ -2,10 +2,18 @@
 Solution to the eleventh challenge, navagation by flashing octopus.
 
 """
+import sys
 from itertools import count
 from os import PathLike
 from pathlib import Path
-from typing import Iterator, List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple, Union
+
+sys.path.append(str(Path(__file__).absolute().parents[1]))
+from aoc.fast_input import (  # pylint: disable=wrong-import-position
+    DigitGrid,
+    read_digit_grid,
+)
+from aoc.instrument import instrument, phase  # pylint: disable=wrong-import-position
 
 ROOT = Path(__file__).absolute().parent
 
@@ -17,10 +25,14 @@ Position = Tuple[int, int]
 """The position of an octopus in the grid."""
 
 
-def parse_input(path: PathLike) -> OctopusGrid:
-    """Parse a list of strings from the input."""
-    with open(path, "r", encoding="utf-8") as file:
-        return list(map(lambda string: list(map(int, string.rstrip())), file))
+def parse_input(path: PathLike, compact: bool = False) -> Union[OctopusGrid, DigitGrid]:
+    """
+    Parse a grid of octopus energy levels from the input. If `compact` is
+    True, return the energy levels as a `DigitGrid`, with one byte per octopus.
+
+    """
+    grid = read_digit_grid(path)
+    return grid if compact else grid.to_lists()
 
 
 def flash_octopus(grid: OctopusGrid, position: Position) -> None:
@@ -51,6 +63,7 @@ def flash_octopus(grid: OctopusGrid, position: Position) -> None:
                     flash_octopus(grid, (x_pos, y_pos))
 
 
+@instrument
 def iterate_flashes(grid: OctopusGrid, n_steps: Optional[int] = None) -> Iterator[int]:
     """
     Model the octopi's flashes, stepping through and yielding the number of
@@ -81,24 +94,28 @@ def iterate_flashes(grid: OctopusGrid, n_steps: Optional[int] = None) -> Iterato
         counter += 1
 
 
-def main():
+def main(path: PathLike = ROOT.joinpath("data", "input_1.txt")):
     """Count the octopus flashes."""
-    grid = parse_input(ROOT.joinpath("data", "input_1.txt"))
+    with phase("parse") as parsing:
+        grid = parse_input(path)
+        parsing.add_items(len(grid))
 
     total_flashes, simultaneous = 0, False
     num_octopi = len(grid) * len(grid[0])
-    for step_number, n_flashes in zip(count(1), iterate_flashes(grid)):
-        total_flashes += n_flashes
+    with phase("solve"):
+        for step_number, n_flashes in zip(count(1), iterate_flashes(grid)):
+            total_flashes += n_flashes
+
+            if step_number == 100:
+                print(f"{total_flashes} flashes in 100 steps.")
 
-        if step_number == 100:
-            print(f"{total_flashes} flashes in 100 steps.")
+            if n_flashes == num_octopi:
+                print(f"First simultaneous flash at step {step_number}.")
+                simultaneous = True
 
-        if n_flashes == num_octopi:
-            print(f"First simultaneous flash at step {step_number}.")
-            simultaneous = True
+            if step_number > 100 and simultaneous:
+                break
 
-        if step_number > 100 and simultaneous:
-            break
 
 if __name__ == "__main__":
     main()
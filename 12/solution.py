@@ -3,11 +3,15 @@ Solution to the twelfth challenge, identification of paths through
 cave networks.
 
 """
+import sys
 from collections import defaultdict
 from os import PathLike
 from pathlib import Path
 from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+sys.path.append(str(Path(__file__).absolute().parents[1]))
+from aoc.instrument import instrument, phase  # pylint: disable=wrong-import-position
+
 ROOT = Path(__file__).absolute().parent
 
 
@@ -88,6 +92,7 @@ class CaveNetwork:  # pylint: disable=too-few-public-methods
 
             yield from self._build_paths(cave, allow_single_second_visit, [*path, cave])
 
+    @instrument
     def enumerate_paths(
         self, allow_single_second_visit: bool = False
     ) -> Iterator[CavePath]:
@@ -114,13 +119,17 @@ def parse_input(path: PathLike) -> CaveNetwork:
         return CaveNetwork(adjacency_list)
 
 
-def main():
+def main(path: PathLike = ROOT.joinpath("data", "input_1.txt")):
     """Check the number of paths through the cave system."""
-    network = parse_input(ROOT.joinpath("data", "input_1.txt"))
-    n_paths = sum(1 for _ in network.enumerate_paths())
+    with phase("parse"):
+        network = parse_input(path)
+
+    with phase("part_1"):
+        n_paths = sum(1 for _ in network.enumerate_paths())
     print(f"{n_paths} paths through the network.")
 
-    n_paths_visit_small_twice = sum(1 for _ in network.enumerate_paths(True))
+    with phase("part_2"):
+        n_paths_visit_small_twice = sum(1 for _ in network.enumerate_paths(True))
     print(
         f"{n_paths_visit_small_twice} paths through the network visiting a "
         + "single small cave twice."
@@ -4,10 +4,14 @@ camera.
 
 """
 import re
+import sys
 from os import PathLike
 from pathlib import Path
 from typing import Collection, List, Tuple
 
+sys.path.append(str(Path(__file__).absolute().parents[1]))
+from aoc.instrument import instrument, phase  # pylint: disable=wrong-import-position
+
 ROOT = Path(__file__).absolute().parent
 
 
@@ -47,6 +51,7 @@ class Sheet:
         rows.append("")
         return "\n".join(rows)
 
+    @instrument
     def fold(self, fold_dimension: str, position: int) -> "Sheet":
         """Fold the sheet, returning a new sheet."""
         if fold_dimension not in ("x", "y"):
@@ -93,18 +98,24 @@ def parse_input(path: PathLike) -> Tuple[Sheet, List[Fold]]:
         return sheet, folds
 
 
-def main():
+def main(path: PathLike = ROOT.joinpath("data", "input_1.txt")):
     """Count the number of marks after folding, then print the code."""
-    sheet, folds = parse_input(ROOT.joinpath("data", "input_1.txt"))
+    with phase("parse") as parsing:
+        sheet, folds = parse_input(path)
+        parsing.add_items(sheet.count_marks())
+
+    with phase("part_1"):
+        sheet = sheet.fold(*folds[0])
+        n_marks = sheet.count_marks()
+    print(f"{n_marks} marks after first fold.")
 
-    for fold_index, fold in enumerate(folds):
-        sheet = sheet.fold(*fold)
-        if fold_index == 0:
-            n_marks = sheet.count_marks()
-            print(f"{n_marks} marks after first fold.")
+    with phase("part_2", items=len(folds) - 1):
+        for fold in folds[1:]:
+            sheet = sheet.fold(*fold)
+        code = str(sheet)
 
     print("\nThe code is:")
-    print(sheet)
+    print(code)
 
 
 if __name__ == "__main__":
@@ -2,12 +2,16 @@
 Solution to the fourteenth challenge, polymerisation.
 
 """
+import sys
 from itertools import tee
 from collections import Counter
 from os import PathLike
 from pathlib import Path
 from typing import Iterator, MutableMapping, Sequence, Tuple
 
+sys.path.append(str(Path(__file__).absolute().parents[1]))
+from aoc.instrument import instrument, phase  # pylint: disable=wrong-import-position
+
 ROOT = Path(__file__).absolute().parent
 
 
@@ -31,6 +35,7 @@ def parse_input(path: PathLike) -> Tuple[Polymer, InsertionRules]:
         return next(lines), {(line[0], line[1]): line[-1] for line in lines}
 
 
+@instrument
 def polymerise(polymer: Polymer, rules: InsertionRules) -> Iterator[Counter[Element]]:
     """Polymerise the chain, yielding the element counts after each step."""
     element_counts = Counter(polymer)
@@ -64,25 +69,29 @@ def polymerise(polymer: Polymer, rules: InsertionRules) -> Iterator[Counter[Elem
         yield element_counts
 
 
-def main():
+def main(path: PathLike = ROOT.joinpath("data", "input_1.txt")):
     """Perform elemental analysis of polymers after a number of steps."""
-    polymer, insertion_rules = parse_input(ROOT.joinpath("data", "input_1.txt"))
-
-    for step, element_counts in enumerate(polymerise(polymer, insertion_rules), 1):
-        if step not in (10, 40):
-            continue
-
-        most_abundant, *_, least_abundant = element_counts.most_common()
-        most_abundant_element, max_count = most_abundant
-        least_abundant_element, min_count = least_abundant
-        print(
-            f"Difference in abundance between {most_abundant_element!r} and "
-            + f"{least_abundant_element!r} is {max_count - min_count} after "
-            + f"{step} steps"
-        )
-
-        if step == 40:
-            break
+    with phase("parse") as parsing:
+        polymer, insertion_rules = parse_input(path)
+        parsing.add_items(len(insertion_rules))
+
+    steps = enumerate(polymerise(polymer, insertion_rules), 1)
+    with phase("solve"):
+        for step, element_counts in steps:
+            if step not in (10, 40):
+                continue
+
+            most_abundant, *_, least_abundant = element_counts.most_common()
+            most_abundant_element, max_count = most_abundant
+            least_abundant_element, min_count = least_abundant
+            print(
+                f"Difference in abundance between {most_abundant_element!r} and "
+                + f"{least_abundant_element!r} is {max_count - min_count} after "
+                + f"{step} steps"
+            )
+
+            if step == 40:
+                break
 
 
 if __name__ == "__main__":
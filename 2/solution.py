@@ -2,10 +2,28 @@
 Solution to the second problem, calculating distance travelled by the sub.
 
 """
-from dataclasses import dataclass
+import json
+import sys
+from array import array
+from dataclasses import asdict, dataclass
+from itertools import accumulate
+from operator import mul
 from os import PathLike
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import Iterable, Iterator, List, Literal, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+sys.path.append(str(Path(__file__).absolute().parents[1]))
+from aoc.fast_input import (  # pylint: disable=wrong-import-position
+    IntArray,
+    iterate_blocks,
+    map_input,
+)
+from aoc.instrument import instrument, phase  # pylint: disable=wrong-import-position
 
 ROOT = Path(__file__).absolute().parent
 
@@ -14,6 +32,21 @@ AimChange = int
 DepthChange = int
 DistanceChange = int
 
+FORWARD, DOWN, UP = b"fdu"
+"""The codes for each direction: the first character of the direction's name."""
+
+DIRECTION_CODES = {"forward": FORWARD, "down": DOWN, "up": UP}
+"""A mapping from the name of a direction to its code."""
+
+Position = Tuple[int, int]
+"""The depth and horizontal distance of the sub."""
+
+_AIM_SIGNS = bytes({DOWN: 1, UP: 255}.get(code, 0) for code in range(256))
+"""A translation table from direction codes to the sign (as a signed byte) of aim."""
+
+_FORWARD_FLAGS = bytes(int(code == FORWARD) for code in range(256))
+"""A translation table from direction codes to whether the sub moves forward."""
+
 
 @dataclass
 class Movement:
@@ -56,6 +89,8 @@ class Submarine:
     """The aim of the sub."""
     use_aim: bool = False
     """If `True`, calculate the sub's depth changes based on aim."""
+    n_movements: int = 0
+    """The number of movements the sub has made."""
 
     def move(self, movement: Movement):
         """Move the sub."""
@@ -67,6 +102,42 @@ class Submarine:
 
         self.depth += depth
         self.distance += distance
+        self.n_movements += 1
+
+    @instrument
+    def ingest(self, movements: Union[Iterable[Movement], "Commands"]):
+        """
+        Move the sub through a batch of movements, continuing from its current
+        position. `Commands` are applied directly from their columns.
+
+        """
+        if not isinstance(movements, Commands):
+            for movement in movements:
+                self.move(movement)
+            return
+
+        depth, distance, aim = self.depth, self.distance, self.aim
+        for code, amount in zip(movements.directions, movements.distances):
+            if code == FORWARD:
+                distance += amount
+                if self.use_aim:
+                    depth += aim * amount
+            elif self.use_aim:
+                aim += amount if code == DOWN else -amount
+            else:
+                depth += amount if code == DOWN else -amount
+
+        self.depth, self.distance, self.aim = depth, distance, aim
+        self.n_movements += len(movements)
+
+    def checkpoint(self) -> str:
+        """Serialise the state of the sub, so it can be restored later."""
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def restore(cls, checkpoint: str) -> "Submarine":
+        """Restore a sub from a checkpoint of its state."""
+        return cls(**json.loads(checkpoint))
 
     @property
     def total_displacement(self) -> int:
@@ -74,39 +145,219 @@ class Submarine:
         return self.depth * self.distance
 
 
-def parse_input(path: PathLike) -> List[Movement]:
-    """Parse the list of directions and distances."""
-    with open(path, "r") as file:
-        operations = []
-        for line in file:
-            direction, distance_str = line.split()
-            operations.append(Movement(direction, int(distance_str)))
+@dataclass
+class Commands:
+    """
+    A compact, columnar representation of a series of movements, with the
+    direction of each movement stored as a single byte (see `DIRECTION_CODES`)
+    and the distances stored in an array.
+
+    """
+
+    directions: bytes
+    """The code for the direction of each movement."""
+    distances: IntArray
+    """The distance travelled in each movement."""
+
+    def __post_init__(self):
+        if len(self.directions) != len(self.distances):
+            raise ValueError("`directions` and `distances` must be the same length")
+        if self.directions.translate(None, bytes([FORWARD, DOWN, UP])):
+            raise ValueError("`directions` contains an invalid direction code")
+
+    def __len__(self) -> int:
+        return len(self.directions)
+
+    def __iter__(self) -> Iterator[Movement]:
+        names = {code: name for name, code in DIRECTION_CODES.items()}
+        for code, distance in zip(self.directions, self.distances):
+            yield Movement(names[code], distance)
+
+    @classmethod
+    def from_movements(cls, movements: Iterable[Movement]) -> "Commands":
+        """Create the columnar representation from a series of movements."""
+        directions, distances = bytearray(), array("q")
+        for movement in movements:
+            try:
+                directions.append(DIRECTION_CODES[movement.direction])
+            except KeyError as err:
+                raise ValueError(f"Invalid direction {movement.direction}") from err
+            distances.append(movement.distance)
+
+        return cls(bytes(directions), distances)
+
+
+@instrument
+def parse_input(
+    path: PathLike, columnar: bool = False
+) -> Union[List[Movement], Commands]:
+    """
+    Parse the list of directions and distances. If `columnar` is True, return
+    them as `Commands` rather than as a list of `Movement`s.
+
+    """
+    if not columnar:
+        with open(path, "r") as file:
+            operations = []
+            for line in file:
+                direction, distance_str = line.split()
+                operations.append(Movement(direction, int(distance_str)))
+
+            return operations
+
+    direction_names = {name.encode() for name in DIRECTION_CODES}
+    directions, distances = bytearray(), array("q")
+    with map_input(path) as buffer:
+        for block in iterate_blocks(buffer):
+            tokens = buffer[block].split()
+            names = tokens[::2]
+            if not set(names) <= direction_names:
+                raise ValueError(f"Invalid direction in {set(names) - direction_names}")
+            directions.extend(name[0] for name in names)
+            distances.extend(map(int, tokens[1::2]))
+
+    return Commands(bytes(directions), distances)
+
+
+def calculate_distances(commands: Commands) -> Tuple[int, int]:
+    """
+    Calculate the displacement of the sub from a series of commands, both
+    without and with the manual's use of aim, in a single pass.
+
+    """
+    # Without aim, the depth is the same as the aim with it.
+    aim, distance, aimed_depth = 0, 0, 0
+    for code, amount in zip(commands.directions, commands.distances):
+        if code == FORWARD:
+            distance += amount
+            aimed_depth += aim * amount
+        elif code == DOWN:
+            aim += amount
+        else:
+            aim -= amount
 
-        return operations
+    return aim * distance, aimed_depth * distance
 
 
-def calculate_distance(movements: Iterable[Movement], read_manual: bool = False) -> int:
+class Trajectory:
+    """
+    The trajectory of the sub through a series of commands, which can be queried
+    for the position of the sub after any number of commands.
+
+    Using the manual, the aim after each command is the prefix sum of the
+    changes in aim, the distance is the prefix sum of the forward movements and
+    the depth is the prefix sum of each forward movement multiplied by the aim.
+    Without the manual, the depth is the same as the aim. These prefix sums are
+    calculated once (with NumPy, where available), after which each query takes
+    constant time.
+
+    """
+
+    def __init__(self, commands: Commands):
+        self._n_commands = len(commands)
+
+        if np is not None:
+            codes = np.frombuffer(commands.directions, dtype=np.uint8)
+            distances = np.frombuffer(commands.distances, dtype=np.int64)
+            signs = (codes == DOWN).astype(np.int64) - (codes == UP)
+            forward = np.where(codes == FORWARD, distances, 0)
+
+            self._aim = np.concatenate(([0], np.cumsum(distances * signs)))
+            self._distance = np.concatenate(([0], np.cumsum(forward)))
+            self._depth = np.concatenate(([0], np.cumsum(forward * self._aim[:-1])))
+            return
+
+        signs = array("b", commands.directions.translate(_AIM_SIGNS))
+        flags = commands.directions.translate(_FORWARD_FLAGS)
+        forward = array("q", map(mul, commands.distances, flags))
+
+        self._aim = array(
+            "q", accumulate(map(mul, commands.distances, signs), initial=0)
+        )
+        self._distance = array("q", accumulate(forward, initial=0))
+        self._depth = array("q", accumulate(map(mul, forward, self._aim), initial=0))
+
+    def __len__(self) -> int:
+        return self._n_commands
+
+    def _check_index(self, n_commands: int):
+        """Check that a number of commands is within the trajectory."""
+        if not 0 <= n_commands <= self._n_commands:
+            raise IndexError(f"Trajectory has {self._n_commands} commands")
+
+    def position_after(self, n_commands: int, read_manual: bool = False) -> Position:
+        """Get the position of the sub after the first `n_commands` commands."""
+        self._check_index(n_commands)
+        depths = self._depth if read_manual else self._aim
+        return int(depths[n_commands]), int(self._distance[n_commands])
+
+    def positions_after(
+        self, n_commands: Iterable[int], read_manual: bool = False
+    ) -> List[Position]:
+        """Get the position of the sub after each of a number of commands."""
+        depths = self._depth if read_manual else self._aim
+
+        if np is not None:
+            indices = np.fromiter(n_commands, dtype=np.int64)
+            if indices.size and (indices.min() < 0 or indices.max() > len(self)):
+                raise IndexError(f"Trajectory has {self._n_commands} commands")
+            return list(zip(depths[indices].tolist(), self._distance[indices].tolist()))
+
+        positions = []
+        for index in n_commands:
+            self._check_index(index)
+            positions.append((depths[index], self._distance[index]))
+        return positions
+
+    def displacement_after(self, n_commands: int, read_manual: bool = False) -> int:
+        """Get the displacement of the sub after the first `n_commands` commands."""
+        depth, distance = self.position_after(n_commands, read_manual)
+        return depth * distance
+
+
+@instrument
+def calculate_distance(
+    movements: Union[Iterable[Movement], Commands],
+    read_manual: bool = False,
+    engine: Literal["step", "scan"] = "step",
+) -> int:
     """
     Calculate displacement of the sub from a series of movements.
 
     `read_manual` indicates whether you have read the sub's manual.
 
+    By default, the sub steps through the movements one at a time. If `engine`
+    is `"scan"`, the displacement is calculated from the prefix sums of a
+    `Trajectory` instead.
+
     """
-    submarine = Submarine(use_aim=read_manual)
+    if engine == "scan":
+        if not isinstance(movements, Commands):
+            movements = Commands.from_movements(movements)
+        return Trajectory(movements).displacement_after(len(movements), read_manual)
+    if engine != "step":
+        raise ValueError("`engine` must be one of `{'step', 'scan'}`")
 
-    for movement in movements:
-        submarine.move(movement)
+    if isinstance(movements, Commands):
+        displacement, aimed_displacement = calculate_distances(movements)
+        return aimed_displacement if read_manual else displacement
 
+    submarine = Submarine(use_aim=read_manual)
+    submarine.ingest(movements)
     return submarine.total_displacement
 
 
-def main():
+def main(path: PathLike = ROOT.joinpath("data", "input_1.txt")):
     """Read in the data and calculate distance travelled."""
-    input_list = parse_input(ROOT.joinpath("data", "input_1.txt"))
+    with phase("parse") as parsing:
+        input_list = parse_input(path)
+        parsing.add_items(len(input_list))
 
-    distance = calculate_distance(input_list)
+    with phase("part_1", items=len(input_list)):
+        distance = calculate_distance(input_list)
     print(f"Calculated distance travelled to be {distance} units.")
-    distance = calculate_distance(input_list, read_manual=True)
+    with phase("part_2", items=len(input_list)):
+        distance = calculate_distance(input_list, read_manual=True)
     print(
         f"Calculated distance travelled to be {distance} units "
         + "(after reading manual)."
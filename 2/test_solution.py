@@ -1,7 +1,17 @@
 """Tests using AOC-provided example data."""
 from pathlib import Path
 
-from solution import parse_input, calculate_distance
+import pytest
+
+import solution
+from solution import (
+    Commands,
+    Submarine,
+    Trajectory,
+    parse_input,
+    calculate_distance,
+    calculate_distances,
+)
 
 
 ROOT = Path(__file__).absolute().parent
@@ -21,3 +31,88 @@ def test_distance_calc_with_aim():
     """
     input_list = parse_input(ROOT.joinpath("data", "test_input_1.txt"))
     assert calculate_distance(input_list, read_manual=True) == 900
+
+
+def test_columnar_distance_calc():
+    """
+    Test that both distances can be calculated in one pass from the columnar
+    representation of the test data.
+
+    """
+    commands = parse_input(ROOT.joinpath("data", "test_input_1.txt"), columnar=True)
+    assert commands.directions == b"fdfudf"
+    assert calculate_distances(commands) == (150, 900)
+    assert calculate_distance(commands, read_manual=True) == 900
+
+
+def test_columnar_round_trip():
+    """Test that the columnar representation matches the list of movements."""
+    movements = parse_input(ROOT.joinpath("data", "input_1.txt"))
+    commands = Commands.from_movements(movements)
+    assert list(commands) == movements
+    assert calculate_distances(commands) == (
+        calculate_distance(movements),
+        calculate_distance(movements, read_manual=True),
+    )
+
+    with pytest.raises(ValueError):
+        Commands(b"fx", commands.distances[:2])
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_trajectory_queries(monkeypatch, use_numpy: bool):
+    """
+    Test that the positions after any number of commands can be calculated
+    from prefix sums, with and without NumPy.
+
+    """
+    if use_numpy and solution.np is None:
+        pytest.skip("NumPy is not installed.")
+    if not use_numpy:
+        monkeypatch.setattr(solution, "np", None)
+
+    movements = parse_input(ROOT.joinpath("data", "input_1.txt"))
+    trajectory = Trajectory(Commands.from_movements(movements))
+    n_commands = [0, 1, 10, 500, len(movements)]
+
+    for read_manual in (False, True):
+        expected = []
+        for index in n_commands:
+            submarine = Submarine(use_aim=read_manual)
+            for movement in movements[:index]:
+                submarine.move(movement)
+            expected.append((submarine.depth, submarine.distance))
+
+        assert trajectory.positions_after(n_commands, read_manual) == expected
+        assert trajectory.position_after(10, read_manual) == expected[2]
+
+    with pytest.raises(IndexError):
+        trajectory.positions_after([len(movements) + 1])
+
+
+def test_scan_distance_calc():
+    """Test that the distance can be calculated from prefix sums."""
+    input_list = parse_input(ROOT.joinpath("data", "test_input_1.txt"))
+    assert calculate_distance(input_list, engine="scan") == 150
+    assert calculate_distance(input_list, read_manual=True, engine="scan") == 900
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+@pytest.mark.parametrize("use_aim", [False, True])
+def test_incremental_submarine(columnar: bool, use_aim: bool):
+    """
+    Test that the sub can ingest batches of movements, and be checkpointed and
+    restored between them.
+
+    """
+    movements = parse_input(ROOT.joinpath("data", "input_1.txt"))
+    expected = calculate_distance(movements, read_manual=use_aim)
+
+    submarine = Submarine(use_aim=use_aim)
+    for start in range(0, len(movements), 300):
+        batch = movements[start : start + 300]
+        submarine.ingest(Commands.from_movements(batch) if columnar else batch)
+        submarine = Submarine.restore(submarine.checkpoint())
+
+    assert submarine.n_movements == len(movements)
+    assert submarine.total_displacement == expected
@@ -3,9 +3,38 @@ Solution to the third challenge, calculating the sub's power
 usage and life support rating.
 
 """
+import sys
+from array import array
+from bisect import bisect_left
+from functools import partial
 from os import PathLike
 from pathlib import Path
-from typing import Sequence, List, Literal
+from typing import (
+    BinaryIO,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+sys.path.append(str(Path(__file__).absolute().parents[1]))
+from aoc.fast_input import (  # pylint: disable=wrong-import-position
+    BLOCK_SIZE,
+    DigitGrid,
+    iterate_blocks,
+    map_input,
+    read_digit_grid,
+)
+from aoc.instrument import instrument, phase  # pylint: disable=wrong-import-position
 
 ROOT = Path(__file__).absolute().parent
 
@@ -13,32 +42,224 @@ DiagnosticBit = int
 DiagnosticArray = List[DiagnosticBit]
 PositionBit = int
 PositionSequence = Sequence[PositionBit]
+Subsystem = Literal["oxygen_generator", "co2_scrubber"]
+
+PACKED_TYPECODE = "Q"
+"""The `array` typecode used for packed readings (unsigned 64-bit integers)."""
+MAX_PACKED_WIDTH = 64
+"""The widest readings which can be stored in an `array` of packed readings."""
+POPCOUNT_CHUNK_SIZE = 2 ** 16
+"""The number of readings unpacked into a bit matrix at a time with NumPy."""
+
+
+class PackedReadings(NamedTuple):
+    """
+    Diagnostic readings packed into integers, with the first bit of each
+    reading as the most significant bit of its value.
+
+    """
+
+    values: Union[array, List[int]]
+    """
+    The packed readings, as an `array` of unsigned 64-bit integers (or, if the
+    readings are wider than 64 bits, a list of `int`).
+    """
+    width: int
+    """The number of bits in each reading."""
 
 
-def parse_diagnostic_input(path: PathLike) -> List[DiagnosticArray]:
+def parse_diagnostic_input(
+    path: PathLike, compact: bool = False
+) -> Union[List[DiagnosticArray], DigitGrid]:
     """
     Parse the list of measurements, returning a list of bits for each entry.
+    If `compact` is True, return the measurements as a `DigitGrid` instead,
+    with one byte per bit.
 
     """
-    with open(path, "r") as file:
-        return [list(map(int, row.rstrip())) for row in file if row]
+    grid = read_digit_grid(path)
+    return grid if compact else grid.to_lists()
 
 
-def parse_power_input(path: PathLike) -> List[PositionSequence]:
+def parse_power_input(path: PathLike, compact: bool = False) -> List[PositionSequence]:
     """
     Parse the list of measurements, returning a list of bits for each
     position. This is a transposed version of the diagnostic input.
 
+    If `compact` is True, the bits for each position are returned as `bytes`
+    rather than as a tuple of integers.
+
+    """
+    grid = read_digit_grid(path)
+    if compact:
+        return [grid.cells[index :: grid.width] for index in range(grid.width)]
+    return list(zip(*grid.to_lists()))
+
+
+def parse_packed_input(path: PathLike) -> PackedReadings:
     """
-    return list(zip(*parse_diagnostic_input(path)))
+    Parse the list of measurements, packing each reading into an integer
+    (using 8 bytes per reading, rather than an `int` object per bit).
+
+    """
+    width = 0
+    values: Union[array, List[int]] = array(PACKED_TYPECODE)
+    with map_input(path) as buffer:
+        for block in iterate_blocks(buffer):
+            tokens = buffer[block].split()
+            if not tokens:
+                continue
+
+            widths = set(map(len, tokens))
+            width = width or widths.pop()
+            if widths - {width}:
+                raise ValueError("Readings must all have the same number of bits.")
+            if width > MAX_PACKED_WIDTH and isinstance(values, array):
+                values = values.tolist()
+            values.extend(map(partial(int, base=2), tokens))
+
+    return PackedReadings(values, width)
+
+
+@instrument
+def count_ones(readings: PackedReadings) -> List[int]:
+    """
+    Count the readings with a 1 in each position (most significant first).
+
+    With NumPy, readings are unpacked into a bit matrix (one byte per bit) a
+    chunk at a time, and the columns summed. Otherwise, the readings are
+    masked one position at a time and the masked values summed.
+
+    """
+    values, width = readings
+    if np is not None and isinstance(values, array):
+        packed = np.frombuffer(values, dtype=np.uint64).astype(">u8")
+        counts = np.zeros(MAX_PACKED_WIDTH, dtype=np.int64)
+        for start in range(0, len(packed), POPCOUNT_CHUNK_SIZE):
+            chunk = packed[start : start + POPCOUNT_CHUNK_SIZE].view(np.uint8)
+            bits = np.unpackbits(chunk.reshape(-1, 8), axis=1)
+            counts += bits.sum(axis=0, dtype=np.int64)
+        return counts[MAX_PACKED_WIDTH - width :].tolist()
+
+    shifts = range(width - 1, -1, -1)
+    return [sum(map((1 << shift).__and__, values)) >> shift for shift in shifts]
+
+
+def _get_power_from_counts(counts: Sequence[int], n_readings: int) -> int:
+    """
+    Get the power consumption from the number of readings with a 1 in each
+    position. As with the mean, ties are rounded (to even) to a 0.
+
+    """
+    gamma = 0
+    for count in counts:
+        gamma = (gamma << 1) | (count * 2 > n_readings)
+    epsilon = gamma ^ ((1 << len(counts)) - 1)
+    return gamma * epsilon
+
+
+class PowerAccumulator:
+    """
+    A running count of the readings with a 1 in each position, which can be
+    updated as readings arrive and queried for the power consumption at any
+    point without keeping the readings themselves.
+
+    """
+
+    def __init__(self):
+        self.counts: List[int] = []
+        """The number of readings with a 1 in each position."""
+        self.n_readings = 0
+        """The number of readings counted."""
+        self._partial = b""
+
+    @property
+    def width(self) -> int:
+        """The number of bits in each reading (0 if none have been counted)."""
+        return len(self.counts)
+
+    @property
+    def power_consumption(self) -> int:
+        """The power consumption for the readings counted so far."""
+        return _get_power_from_counts(self.counts, self.n_readings)
 
+    def update(self, readings: Iterable[Union[str, bytes]]) -> "PowerAccumulator":
+        """Count a number of complete readings (with or without line breaks)."""
+        tokens = [
+            reading.encode() if isinstance(reading, str) else reading
+            for reading in readings
+        ]
+        return self._count(b" ".join(tokens).split())
 
-def get_power_consumption(positions: Sequence[PositionSequence]) -> int:
+    def feed(self, data: bytes) -> "PowerAccumulator":
+        """
+        Count the readings in a chunk of a stream. The chunk doesn't have to
+        end at a line break: a partial reading at the end is kept until the
+        rest of it arrives (or `flush` is called).
+
+        """
+        data = self._partial + data
+        end = data.rfind(b"\n") + 1
+        self._partial = data[end:]
+        return self._count(data[:end].split())
+
+    def flush(self) -> "PowerAccumulator":
+        """Count the partial reading at the end of the stream, if there is one."""
+        partial, self._partial = self._partial, b""
+        return self._count(partial.split())
+
+    def _count(self, tokens: List[bytes]) -> "PowerAccumulator":
+        """Count a number of readings, each a string of bits."""
+        if not tokens:
+            return self
+
+        width = self.width or len(tokens[0])
+        joined = b"".join(tokens)
+        if set(map(len, tokens)) != {width}:
+            raise ValueError("Readings must all have the same number of bits.")
+        if joined.translate(None, b"01"):
+            raise ValueError("Readings must only contain the bits 0 and 1.")
+
+        if not self.counts:
+            self.counts = [0] * width
+        for index in range(width):
+            self.counts[index] += joined[index::width].count(b"1")
+        self.n_readings += len(tokens)
+        return self
+
+    def stream(self, stream: BinaryIO, chunk_size: int = 0) -> Iterator[int]:
+        """
+        Count the readings from a binary stream (a file, or a socket opened
+        with `makefile("rb")`) in chunks of `chunk_size` bytes (by default,
+        `BLOCK_SIZE`), yielding the power consumption after each chunk.
+
+        """
+        chunk_size = chunk_size or BLOCK_SIZE
+        while True:
+            data = stream.read(chunk_size)
+            if not data:
+                break
+            yield self.feed(data).power_consumption
+
+        if self._partial:
+            yield self.flush().power_consumption
+
+
+@instrument
+def get_power_consumption(
+    positions: Union[Sequence[PositionSequence], PackedReadings]
+) -> int:
     """
     Get the sub's power consumption by calculating the product of the
     gamma and epsilon rates.
 
+    If `positions` are packed readings, the most common bits are found by
+    counting the ones in each position rather than averaging them.
+
     """
+    if isinstance(positions, PackedReadings):
+        return _get_power_from_counts(count_ones(positions), len(positions.values))
+
     most_common_bits = [round(sum(bits) / len(bits)) for bits in positions]
     least_common_bits = [int(not digit) for digit in most_common_bits]
     gamma_bitstring = "".join(map(str, most_common_bits))
@@ -47,9 +268,10 @@ def get_power_consumption(positions: Sequence[PositionSequence]) -> int:
     return int(gamma_bitstring, 2) * int(epsilon_bitstring, 2)
 
 
+@instrument
 def get_subsystem_rating(
     readings: Sequence[DiagnosticArray],
-    subsystem: Literal["oxygen_generator", "co2_scrubber"],
+    subsystem: Subsystem,
     bit_index: int = 0,
 ) -> int:
     """Get the rating for a given life support subsystem."""
@@ -71,21 +293,121 @@ def get_subsystem_rating(
     return get_subsystem_rating(to_keep, subsystem, bit_index + 1)
 
 
-def get_life_support_rating(readings: Sequence[DiagnosticArray]):
-    """Get the rating for the life support system."""
+class LifeSupportIndex:
+    """
+    An index of packed readings, which can be queried for subsystem ratings
+    without copying the readings.
+
+    The readings are sorted once, so that the readings starting with any
+    prefix form a contiguous range, which is split by the next bit at the
+    first reading at least `prefix` followed by a 1. Each subsystem's rating
+    is found by narrowing the range one bit at a time, with a binary search
+    for each bit (`O(width log n)` per query, after sorting).
+
+    """
+
+    def __init__(self, readings: PackedReadings):
+        values, self.width = readings
+        if np is not None and isinstance(values, array):
+            ordered = np.sort(np.frombuffer(values, dtype=np.uint64))
+            self._values: Union[array, List[int]] = array(
+                PACKED_TYPECODE, ordered.tobytes()
+            )
+        elif isinstance(values, array):
+            self._values = array(PACKED_TYPECODE, sorted(values))
+        else:
+            self._values = sorted(values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _find_range(self, prefix: str) -> Tuple[int, int, int]:
+        """
+        Find the range of (sorted) readings which start with a prefix, and the
+        lowest value a reading with that prefix could have.
+
+        """
+        if len(prefix) > self.width:
+            raise ValueError(f"Prefix is longer than the readings ({self.width})")
+
+        shift = self.width - len(prefix)
+        lowest = int(prefix, 2) << shift if prefix else 0
+        low = bisect_left(self._values, lowest)
+        return low, bisect_left(self._values, lowest + (1 << shift), low), lowest
+
+    def count(self, prefix: str = "") -> int:
+        """Count the readings which start with a prefix of bits."""
+        low, high, _ = self._find_range(prefix)
+        return high - low
+
+    def rating(self, subsystem: Subsystem, prefix: str = "") -> int:
+        """
+        Get the rating for a given life support subsystem, optionally
+        considering only the readings which start with a prefix of bits.
+
+        """
+        if subsystem not in ("oxygen_generator", "co2_scrubber"):
+            raise ValueError("Invalid subsystem")
+
+        values = self._values
+        low, high, lowest = self._find_range(prefix)
+        for shift in range(self.width - len(prefix) - 1, -1, -1):
+            if high - low <= 1:
+                break
+
+            split = bisect_left(values, lowest | (1 << shift), low, high)
+            keep_ones = high - split >= split - low
+            if subsystem == "co2_scrubber":
+                keep_ones = not keep_ones
+
+            if keep_ones:
+                low, lowest = split, lowest | (1 << shift)
+            else:
+                high = split
+
+        if low == high:
+            raise ValueError(f"No readings remain for the {subsystem} rating")
+        return values[low]
+
+    def life_support_rating(self, prefix: str = "") -> int:
+        """Get the rating for the life support system."""
+        return self.rating("oxygen_generator", prefix) * self.rating(
+            "co2_scrubber", prefix
+        )
+
+
+@instrument
+def get_life_support_rating(
+    readings: Union[Sequence[DiagnosticArray], PackedReadings]
+) -> int:
+    """
+    Get the rating for the life support system.
+
+    If `readings` are packed readings, they are indexed (see `LifeSupportIndex`)
+    rather than filtered by copying them at each bit.
+
+    """
+    if isinstance(readings, PackedReadings):
+        return LifeSupportIndex(readings).life_support_rating()
+
     oxygen_gen_rating = get_subsystem_rating(readings, "oxygen_generator")
     co2_scrubber_rating = get_subsystem_rating(readings, "co2_scrubber")
     return oxygen_gen_rating * co2_scrubber_rating
 
 
-def main():
+def main(path: PathLike = ROOT.joinpath("data", "input_1.txt")):
     """Read in the data and calculate distance travelled."""
-    power_input = parse_power_input(ROOT.joinpath("data", "input_1.txt"))
-    power_consumption = get_power_consumption(power_input)
+    with phase("parse") as parsing:
+        power_input = parse_power_input(path)
+        diagnostic_input = parse_diagnostic_input(path)
+        parsing.add_items(len(diagnostic_input))
+
+    with phase("part_1", items=len(diagnostic_input)):
+        power_consumption = get_power_consumption(power_input)
     print(f"Calculated power to be {power_consumption} units.")
 
-    diagnostic_input = parse_diagnostic_input(ROOT.joinpath("data", "input_1.txt"))
-    life_support_rating = get_life_support_rating(diagnostic_input)
+    with phase("part_2", items=len(diagnostic_input)):
+        life_support_rating = get_life_support_rating(diagnostic_input)
     print(f"Calculated life support rating to be {life_support_rating}.")
 
 
@@ -1,8 +1,16 @@
 """Tests using AOC-provided example data."""
+import io
 from pathlib import Path
 
+import pytest
+
+import solution
 from solution import (
+    LifeSupportIndex,
+    PowerAccumulator,
+    count_ones,
     parse_diagnostic_input,
+    parse_packed_input,
     parse_power_input,
     get_power_consumption,
     get_subsystem_rating,
@@ -18,6 +26,14 @@ def test_power_calc():
     assert get_power_consumption(input_list) == 198
 
 
+def test_power_calc_compact():
+    """Test that the power can be calculated from the compact input."""
+    input_list = parse_power_input(
+        ROOT.joinpath("data", "test_input_1.txt"), compact=True
+    )
+    assert get_power_consumption(input_list) == 198
+
+
 def test_get_subsystem_rating():
     """Test that getting a life support subsystem's rating works."""
     input_list = parse_diagnostic_input(ROOT.joinpath("data", "test_input_1.txt"))
@@ -29,3 +45,121 @@ def test_get_life_support_rating():
     """Test that getting the life support rating works."""
     input_list = parse_diagnostic_input(ROOT.joinpath("data", "test_input_1.txt"))
     assert get_life_support_rating(input_list) == 230
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_power_calc_packed(monkeypatch, use_numpy: bool):
+    """
+    Test that the power can be calculated from the packed input, with and
+    without NumPy.
+
+    """
+    if use_numpy and solution.np is None:
+        pytest.skip("NumPy is not installed.")
+    if not use_numpy:
+        monkeypatch.setattr(solution, "np", None)
+
+    readings = parse_packed_input(ROOT.joinpath("data", "test_input_1.txt"))
+    assert readings.width == 5
+    assert count_ones(readings) == [7, 5, 8, 7, 5]
+    assert get_power_consumption(readings) == 198
+
+    full_input = ROOT.joinpath("data", "input_1.txt")
+    expected = get_power_consumption(parse_power_input(full_input))
+    assert get_power_consumption(parse_packed_input(full_input)) == expected
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_count_ones_wide(monkeypatch, tmp_path: Path, use_numpy: bool):
+    """Test that the ones are counted in 64-bit and wider readings."""
+    if use_numpy and solution.np is None:
+        pytest.skip("NumPy is not installed.")
+    if not use_numpy:
+        monkeypatch.setattr(solution, "np", None)
+
+    for width in (64, 70):
+        rows = ["1" * width, "0" * width, "1" + "0" * (width - 2) + "1"]
+        path = tmp_path.joinpath(f"readings_{width}.txt")
+        path.write_text("\n".join(rows) + "\n")
+
+        readings = parse_packed_input(path)
+        assert readings.width == width
+        assert count_ones(readings) == [2] + [1] * (width - 2) + [2]
+
+
+def test_parse_packed_input_invalid(tmp_path: Path):
+    """Test that readings of different widths are rejected."""
+    path = tmp_path.joinpath("readings.txt")
+    path.write_text("0101\n011\n")
+    with pytest.raises(ValueError):
+        parse_packed_input(path)
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_life_support_index(monkeypatch, use_numpy: bool):
+    """
+    Test that the life support index gives the same ratings as filtering the
+    readings, with and without NumPy.
+
+    """
+    if use_numpy and solution.np is None:
+        pytest.skip("NumPy is not installed.")
+    if not use_numpy:
+        monkeypatch.setattr(solution, "np", None)
+
+    path = ROOT.joinpath("data", "test_input_1.txt")
+    index = LifeSupportIndex(parse_packed_input(path))
+    assert index.rating("oxygen_generator") == 23
+    assert index.rating("co2_scrubber") == 10
+    assert index.life_support_rating() == 230
+    assert index.count() == 12
+
+    readings = parse_diagnostic_input(path)
+    for prefix in ("0", "1", "10", "110"):
+        bits = list(map(int, prefix))
+        matching = [reading for reading in readings if reading[: len(bits)] == bits]
+        assert index.count(prefix) == len(matching)
+        for subsystem in ("oxygen_generator", "co2_scrubber"):
+            expected = get_subsystem_rating(matching, subsystem, len(bits))
+            assert index.rating(subsystem, prefix) == expected
+
+    full_input = ROOT.joinpath("data", "input_1.txt")
+    expected = get_life_support_rating(parse_diagnostic_input(full_input))
+    assert get_life_support_rating(parse_packed_input(full_input)) == expected
+
+    with pytest.raises(ValueError):
+        index.rating("hull")
+
+
+def test_power_accumulator():
+    """
+    Test that the power can be calculated from readings as they arrive, in
+    chunks which don't end at line breaks.
+
+    """
+    path = ROOT.joinpath("data", "test_input_1.txt")
+    data = path.read_bytes().rstrip(b"\n")
+
+    accumulator = PowerAccumulator()
+    assert accumulator.power_consumption == 0
+    powers = list(accumulator.stream(io.BytesIO(data), chunk_size=7))
+    assert powers[-1] == 198
+    assert accumulator.n_readings == 12
+    assert accumulator.counts == [7, 5, 8, 7, 5]
+
+    accumulator = PowerAccumulator().update(["00100", b"11110\n"])
+    assert (accumulator.n_readings, accumulator.counts) == (2, [1, 1, 2, 1, 0])
+    lines = path.read_text().splitlines()
+    assert accumulator.update(lines[2:]).power_consumption == 198
+
+    full_input = ROOT.joinpath("data", "input_1.txt")
+    with open(full_input, "rb") as file:
+        *_, power = PowerAccumulator().stream(file, chunk_size=1000)
+    assert power == get_power_consumption(parse_power_input(full_input))
+
+
+@pytest.mark.parametrize("readings", [["0101", "011"], ["0102"]])
+def test_power_accumulator_invalid(readings):
+    """Test that invalid readings are rejected by the power accumulator."""
+    with pytest.raises(ValueError):
+        PowerAccumulator().update(readings)
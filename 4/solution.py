@@ -2,10 +2,38 @@
 Solution to the fourth challenge, beating the squid at bingo.
 
 """
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
 from os import PathLike
-from itertools import chain, islice
+from itertools import chain, compress, islice, repeat
 from pathlib import Path
-from typing import FrozenSet, Iterator, Optional, Sequence, Set, Tuple
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+sys.path.append(str(Path(__file__).absolute().parents[1]))
+from aoc.fast_input import (  # pylint: disable=wrong-import-position
+    IntArray,
+    read_comma_ints,
+    read_line_ints,
+)
+from aoc.instrument import instrument, phase  # pylint: disable=wrong-import-position
 
 ROOT = Path(__file__).absolute().parent
 
@@ -19,6 +47,14 @@ BoardScore = int
 """The bingo board's contribution to the final score."""
 Score = int
 """The score of the board. A `BoardScore` multiplied by the last number called."""
+DrawIndex = int
+"""The position of a number in the sequence of numbers called."""
+
+Winner = Tuple[int, Score]
+"""The index of a winning board, and its score."""
+
+_INVERT_MASK = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+"""A translation table swapping marked and unmarked cells in a mask."""
 
 
 class BingoBoard:
@@ -38,6 +74,16 @@ class BingoBoard:
         """An iterator over the columns in the board (as sets of ints)."""
         return iter(self._columns)
 
+    @property
+    def grid(self) -> List[List[int]]:
+        """The board as a list of lists (rows) of integers."""
+        column_indices = {
+            number: index
+            for index, column in enumerate(self._columns)
+            for number in column
+        }
+        return [sorted(row, key=column_indices.__getitem__) for row in self._rows]
+
     def score(self, numbers: Set[int]) -> Optional[BoardScore]:
         """
         Return the board's component of the final bingo score. This should be
@@ -50,12 +96,162 @@ class BingoBoard:
         return None
 
 
-def parse_input(path: PathLike) -> Tuple[Sequence[BingoBoard], Sequence[int]]:
+class BingoBoardSet:
+    """
+    A set of square bingo boards, stored contiguously. The numbers on all of
+    the boards are kept in one array (board by board, and row by row), with a
+    parallel mask of which numbers have been marked (one byte per number).
+
+    Boards can be accessed as `BingoBoard`s, but the set can also be marked and
+    checked for winners as a whole (with NumPy, where it's available).
+
+    """
+
+    def __init__(self, cells: IntArray, size: int = 5):
+        if size < 1 or len(cells) % (size * size):
+            raise ValueError(f"Boards must all have {size} rows of {size} numbers.")
+        self.cells = cells
+        """The numbers on the boards, board by board and row by row."""
+        self.size = size
+        """The number of rows (and columns) in each board."""
+        self.marked = bytearray(len(cells))
+        """Whether each of the numbers on the boards has been marked."""
+
+    def __len__(self) -> int:
+        return len(self.cells) // (self.size * self.size)
+
+    def __getitem__(self, index: int) -> BingoBoard:
+        return BingoBoard(self.grid(index))
+
+    def _board_slice(self, index: int) -> slice:
+        """Get the slice of the cells (and mask) for a board."""
+        if not 0 <= index < len(self):
+            raise IndexError("Board index out of range")
+        start = index * self.size * self.size
+        return slice(start, start + self.size * self.size)
+
+    def grid(self, index: int) -> List[List[int]]:
+        """Get a board as a list of lists (rows) of integers."""
+        cells = self.cells[self._board_slice(index)]
+        size = self.size
+        return [
+            cells[start : start + size].tolist()
+            for start in range(0, len(cells), size)
+        ]
+
+    def as_array(self):
+        """
+        Get a (zero-copy) NumPy view of the numbers on the boards, with a shape
+        of (boards, rows, columns).
+
+        """
+        return np.frombuffer(self.cells, dtype=np.int64).reshape(
+            -1, self.size, self.size
+        )
+
+    def reset(self):
+        """Unmark all of the numbers on the boards."""
+        self.marked = bytearray(len(self.cells))
+
+    def mark(self, number: int) -> int:
+        """Mark a number on all of the boards, returning how many were marked."""
+        if np is not None:
+            matches = np.frombuffer(self.cells, dtype=np.int64) == number
+            np.frombuffer(self.marked, dtype=np.uint8)[matches] = 1
+            return int(np.count_nonzero(matches))
+
+        n_marked, position = 0, -1
+        while True:
+            try:
+                position = self.cells.index(number, position + 1)
+            except ValueError:
+                return n_marked
+            self.marked[position] = 1
+            n_marked += 1
+
+    def winners(self) -> List[int]:
+        """Get the indices of the boards with a complete row or column."""
+        size = self.size
+        if np is not None:
+            marked = np.frombuffer(self.marked, dtype=np.bool_).reshape(-1, size, size)
+            complete = marked.all(axis=2).any(axis=1) | marked.all(axis=1).any(axis=1)
+            return np.flatnonzero(complete).tolist()
+
+        complete_line = b"\x01" * size
+        winners = []
+        for index in range(len(self)):
+            mask = self.marked[self._board_slice(index)]
+            lines = chain(
+                (mask[start : start + size] for start in range(0, len(mask), size)),
+                (mask[start::size] for start in range(size)),
+            )
+            if complete_line in lines:
+                winners.append(index)
+        return winners
+
+    def unmarked_sum(self, index: int) -> BoardScore:
+        """Get the sum of the unmarked numbers on a board."""
+        board = self._board_slice(index)
+        unmarked = self.marked[board].translate(_INVERT_MASK)
+        return sum(compress(self.cells[board], unmarked))
+
+    def winning_scores(
+        self, number_sequence: Iterable[int]
+    ) -> Iterator[Tuple[int, Score]]:
+        """
+        Play bingo with a sequence of numbers (starting from unmarked boards),
+        yielding the index and score of each board in order of when it won
+        (and in the order of the boards, for boards which win on the same
+        number).
+
+        """
+        self.reset()
+        won = bytearray(len(self))
+        n_remaining = len(self)
+
+        for number in number_sequence:
+            if not n_remaining:
+                return
+            if not self.mark(number):
+                continue
+
+            for index in self.winners():
+                if not won[index]:
+                    won[index] = 1
+                    n_remaining -= 1
+                    yield index, self.unmarked_sum(index) * number
+
+        if n_remaining:
+            raise ValueError("No winning boards.")
+
+
+def _parse_board_set(path: PathLike) -> Tuple[BingoBoardSet, IntArray]:
+    """Parse the bingo input directly into a `BingoBoardSet`."""
+    with open(path, "rb") as file:
+        header = file.readline()
+        first_row = next(filter(None, (line.split() for line in file)), [])
+
+    size = len(first_row)
+    if not size:
+        raise ValueError("No bingo boards.")
+    return BingoBoardSet(read_line_ints(path, len(header)), size), read_comma_ints(path)
+
+
+@instrument
+def parse_input(
+    path: PathLike, compact: bool = False
+) -> Tuple[Union[Sequence[BingoBoard], BingoBoardSet], Sequence[int]]:
     """
     Parse the bingo input, returning a sequence of `BingoBoard`s and a sequence
     of the numbers being called.
 
+    If `compact` is True, the boards are returned as a `BingoBoardSet` (and the
+    numbers as an `array`).
+
     """
+    if compact:
+        return _parse_board_set(path)
+
     boards = []
 
     with open(path, "r") as file:
@@ -75,6 +271,7 @@ def parse_input(path: PathLike) -> Tuple[Sequence[BingoBoard], Sequence[int]]:
     return boards, numbers
 
 
+@instrument
 def get_winning_scores(
     boards: Sequence[BingoBoard], number_sequence: Iterator[int]
 ) -> Iterator[Tuple[BingoBoard, Score]]:
@@ -106,18 +303,324 @@ def get_winning_scores(
     raise ValueError("No winning boards.")
 
 
-def main():
+class BingoIndex:
+    """
+    An index of the positions of each number in a sequence of bingo boards,
+    used to play bingo on all of the boards at once.
+
+    Each number is mapped to the boards containing it, with the row and column
+    it is in. When a number is called, only the rows and columns it is in are
+    touched: each keeps a count of its marked numbers (so a board has won when
+    one of its counts reaches the length of the line), and each board keeps a
+    running sum of its unmarked numbers.
+
+    """
+
+    def __init__(self, boards: Sequence[BingoBoard]):
+        self.boards = boards
+        self._positions: Dict[int, array] = {}
+        """The board, row and column (line) of each number, in flat arrays."""
+        self._line_lengths = bytearray()
+        """The number of numbers in each row and column of each board."""
+        self._totals = array("q")
+        """The sum of the numbers on each board."""
+
+        for board_index, board in enumerate(boards):
+            rows, columns = list(board.rows), list(board.columns)
+            first_row = len(self._line_lengths)
+            first_column = first_row + len(rows)
+            column_lines = {
+                number: line
+                for line, column in enumerate(columns, first_column)
+                for number in column
+            }
+            self._line_lengths.extend(map(len, chain(rows, columns)))
+
+            for row_line, row in enumerate(rows, first_row):
+                for number in row:
+                    positions = self._positions.setdefault(number, array("q"))
+                    positions.extend((board_index, row_line, column_lines[number]))
+            self._totals.append(sum(map(sum, rows)))
+
+    def winning_scores(
+        self, number_sequence: Iterable[int]
+    ) -> Iterator[Tuple[int, Score]]:
+        """
+        Play bingo with a sequence of numbers, yielding the index and score of
+        each board in order of when it won (and in the order of the boards,
+        for boards which win on the same number).
+
+        """
+        line_lengths = self._line_lengths
+        hits = bytearray(len(line_lengths))
+        unmarked = array("q", self._totals)
+        won = bytearray(len(self.boards))
+        n_remaining = len(self.boards)
+        called: Set[int] = set()
+
+        for number in number_sequence:
+            if number in called or number not in self._positions:
+                continue
+            called.add(number)
+
+            winners = []
+            positions = iter(self._positions[number])
+            for board, row, column in zip(positions, positions, positions):
+                unmarked[board] -= number
+                hits[row] += 1
+                hits[column] += 1
+                if won[board]:
+                    continue
+                if (
+                    hits[row] == line_lengths[row]
+                    or hits[column] == line_lengths[column]
+                ):
+                    won[board] = 1
+                    winners.append(board)
+
+            for board in sorted(winners):
+                yield board, unmarked[board] * number
+
+            n_remaining -= len(winners)
+            if not n_remaining:
+                return
+
+        raise ValueError("No winning boards.")
+
+
+@instrument
+def get_winning_scores_indexed(
+    boards: Sequence[BingoBoard], number_sequence: Iterable[int]
+) -> Iterator[Tuple[BingoBoard, Score]]:
+    """
+    Check a sequence of bingo boards, yielding the board and score in order of
+    when the board won, using a `BingoIndex` of the boards.
+
+    Unlike `get_winning_scores`, this checks for winning boards from the first
+    number called (rather than the sixth).
+
+    """
+    index = BingoIndex(boards)
+    for board_index, score in index.winning_scores(number_sequence):
+        yield boards[board_index], score
+
+
+class BoardRanking:
+    """
+    The order in which a sequence of bingo boards win, for a given sequence of
+    numbers, without playing the game.
+
+    Each number is mapped to the position at which it is first called. A line
+    is complete when its last number is called (the latest position of its
+    numbers) and a board wins when its first line is complete, so the position
+    at which each board wins is the minimum over its lines of the maximum
+    position of their numbers. The boards are then ranked by this position,
+    and scored only when their score is needed.
+
+    """
+
+    def __init__(
+        self,
+        boards: Union[Sequence[BingoBoard], BingoBoardSet],
+        number_sequence: Iterable[int],
+    ):
+        self.boards = boards
+        self.numbers = list(number_sequence)
+        self._draw_indices: Dict[int, DrawIndex] = {}
+        for draw_index, number in enumerate(self.numbers):
+            self._draw_indices.setdefault(number, draw_index)
+
+        self.win_times = self._get_win_times()
+        """
+        The position of the number on which each board wins (or the number of
+        numbers called, for boards which don't win).
+        """
+        self.order = self._rank()
+        """
+        The indices of the boards which win, in order of when they win (and in
+        the order of the boards, for boards which win on the same number).
+        """
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def _get_win_times(self) -> List[DrawIndex]:
+        """
+        Get the position at which each board wins. With NumPy (if the boards
+        are all the same size), this is done for all of the boards at once.
+
+        """
+        never = len(self.numbers)
+        if not self._draw_indices:
+            return [never] * len(self.boards)
+
+        cells = None
+        if np is not None and isinstance(self.boards, BingoBoardSet):
+            cells = self.boards.as_array()
+        elif np is not None:
+            grids = [board.grid for board in self.boards]
+            shapes = {(len(grid), len(row)) for grid in grids for row in grid}
+            if len(shapes) == 1:
+                cells = np.array(grids, dtype=np.int64)
+
+        if cells is not None:
+            called = np.array(sorted(self._draw_indices), dtype=np.int64)
+            draw_indices = [self._draw_indices[number] for number in called.tolist()]
+            # Numbers which aren't called are looked up at the end, as `never`.
+            draw_indices = np.array(draw_indices + [never], dtype=np.int64)
+
+            positions = np.minimum(np.searchsorted(called, cells), len(called) - 1)
+            positions[called[positions] != cells] = -1
+            times = draw_indices[positions]
+            row_times = times.max(axis=2).min(axis=1)
+            column_times = times.max(axis=1).min(axis=1)
+            return np.minimum(row_times, column_times).tolist()
+
+        win_times = []
+        for board in self.boards:
+            line_times = [
+                max(map(self._draw_indices.get, line, repeat(never)))
+                for line in chain(board.rows, board.columns)
+            ]
+            win_times.append(min(line_times, default=never))
+        return win_times
+
+    def _rank(self) -> List[int]:
+        """Rank the boards which win by when they win (in a stable order)."""
+        never = len(self.numbers)
+        if np is not None:
+            win_times = np.array(self.win_times, dtype=np.int64)
+            ranked = np.argsort(win_times, kind="stable")
+            return ranked[win_times[ranked] < never].tolist()
+
+        ranked = sorted(range(len(self.boards)), key=self.win_times.__getitem__)
+        return [index for index in ranked if self.win_times[index] < never]
+
+    def score(self, board_index: int) -> Score:
+        """Get the score of a board when it wins."""
+        win_time = self.win_times[board_index]
+        if win_time >= len(self.numbers):
+            raise ValueError(f"Board {board_index + 1} doesn't win.")
+
+        never = len(self.numbers)
+        board_score = sum(
+            number
+            for row in self.boards[board_index].rows
+            for number in row
+            if self._draw_indices.get(number, never) > win_time
+        )
+        return board_score * self.numbers[win_time]
+
+    def winning_scores(self) -> Iterator[Tuple[BingoBoard, Score]]:
+        """Yield each winning board and its score, in order of when it won."""
+        for board_index in self.order:
+            yield self.boards[board_index], self.score(board_index)
+
+    def first(self) -> Tuple[BingoBoard, Score]:
+        """Get the first board to win, and its score."""
+        if not self.order:
+            raise ValueError("No winning boards.")
+        return self.boards[self.order[0]], self.score(self.order[0])
+
+    def last(self) -> Tuple[BingoBoard, Score]:
+        """Get the last board to win, and its score."""
+        if not self.order:
+            raise ValueError("No winning boards.")
+        return self.boards[self.order[-1]], self.score(self.order[-1])
+
+
+@instrument
+def rank_boards(
+    boards: Union[Sequence[BingoBoard], BingoBoardSet], number_sequence: Iterable[int]
+) -> BoardRanking:
+    """Rank a sequence of bingo boards by when they win, without playing."""
+    return BoardRanking(boards, number_sequence)
+
+
+_SHARED_MEMORY: Optional[SharedMemory] = None
+"""The shared memory holding the boards, in a worker process."""
+_SHARED_BOARDS: Optional[BingoBoardSet] = None
+"""The boards being evaluated, in a worker process."""
+
+
+def _attach_boards(name: str, size: int):
+    """Attach a worker process to the boards in shared memory."""
+    global _SHARED_MEMORY, _SHARED_BOARDS  # pylint: disable=global-statement
+    _SHARED_MEMORY = SharedMemory(name=name)
+    _SHARED_BOARDS = BingoBoardSet(_SHARED_MEMORY.buf.cast("q"), size)
+
+
+def _evaluate_sequence(
+    number_sequence: Sequence[int], boards: Optional[BingoBoardSet] = None
+) -> Tuple[Optional[Winner], Optional[Winner]]:
+    """
+    Get the first and last boards to win with a sequence of numbers (by
+    default, from the boards in shared memory).
+
+    """
+    if boards is None:
+        boards = _SHARED_BOARDS
+    ranking = BoardRanking(boards, number_sequence)
+    if not ranking.order:
+        return None, None
+    first, last = ranking.order[0], ranking.order[-1]
+    return (first, ranking.score(first)), (last, ranking.score(last))
+
+
+@instrument
+def evaluate_sequences(
+    boards: BingoBoardSet,
+    number_sequences: Iterable[Sequence[int]],
+    max_workers: Optional[int] = None,
+    chunk_size: int = 16,
+) -> List[Tuple[Optional[Winner], Optional[Winner]]]:
+    """
+    Get the first and last boards to win (and their scores) with each of a
+    number of sequences of numbers. Boards which never win are ignored, and a
+    sequence with which no boards win gives `None` for both.
+
+    The boards are copied once into shared memory, from which each of a pool of
+    `max_workers` worker processes (by default, one per CPU) ranks the boards
+    for `chunk_size` sequences at a time. If `max_workers` is 1, the sequences
+    are evaluated in this process.
+
+    """
+    if max_workers == 1 or not boards.cells:
+        return [_evaluate_sequence(numbers, boards) for numbers in number_sequences]
+
+    cells = memoryview(boards.cells).cast("B")
+    memory = SharedMemory(create=True, size=len(cells))
+    try:
+        memory.buf[: len(cells)] = cells
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_attach_boards,
+            initargs=(memory.name, boards.size),
+        ) as executor:
+            return list(
+                executor.map(_evaluate_sequence, number_sequences, chunksize=chunk_size)
+            )
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def main(path: PathLike = ROOT.joinpath("data", "input_1.txt")):
     """Read in the data and output the first and last bingo scores."""
-    boards, number_sequence = parse_input(ROOT.joinpath("data", "input_1.txt"))
+    with phase("parse") as parsing:
+        boards, number_sequence = parse_input(path)
+        parsing.add_items(len(boards))
     score_iterator = get_winning_scores(boards, number_sequence)
 
-    first_board, first_score = next(score_iterator)
-    first_board_index = boards.index(first_board) + 1
+    with phase("part_1"):
+        first_board, first_score = next(score_iterator)
+        first_board_index = boards.index(first_board) + 1
     print(f"First winning bingo score is {first_score} (board {first_board_index}).")
 
     try:
-        *_, (last_board, last_score) = score_iterator
-        last_board_index = boards.index(last_board) + 1
+        with phase("part_2", items=len(boards)):
+            *_, (last_board, last_score) = score_iterator
+            last_board_index = boards.index(last_board) + 1
     except StopIteration:
         last_board, last_score = first_board, first_score
         last_board_index = first_board_index
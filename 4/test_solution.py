@@ -1,7 +1,18 @@
 """Tests using AOC-provided example data."""
+import random
 from pathlib import Path
 
-from solution import parse_input, get_winning_scores
+import pytest
+
+import solution
+from solution import (
+    BingoBoardSet,
+    evaluate_sequences,
+    parse_input,
+    get_winning_scores,
+    get_winning_scores_indexed,
+    rank_boards,
+)
 
 ROOT = Path(__file__).absolute().parent
 
@@ -18,3 +29,130 @@ def test_last_score_calc():
     boards, numbers = parse_input(ROOT.joinpath("data", "test_input_1.txt"))
     *_, (_, last_score) = get_winning_scores(boards, numbers)
     assert last_score == 1924
+
+
+@pytest.mark.parametrize("filename", ["test_input_1.txt", "input_1.txt"])
+def test_indexed_scores(filename: str):
+    """Test that the indexed engine gives the same winners in the same order."""
+    boards, numbers = parse_input(ROOT.joinpath("data", filename))
+    expected = list(get_winning_scores(boards, numbers))
+    assert list(get_winning_scores_indexed(boards, numbers)) == expected
+
+
+def test_indexed_scores_unfinished():
+    """Test that the indexed engine fails if some boards never win."""
+    boards, numbers = parse_input(ROOT.joinpath("data", "test_input_1.txt"))
+    with pytest.raises(ValueError):
+        list(get_winning_scores_indexed(boards, numbers[:12]))
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+@pytest.mark.parametrize("filename", ["test_input_1.txt", "input_1.txt"])
+def test_ranked_scores(monkeypatch, use_numpy: bool, filename: str):
+    """
+    Test that ranking the boards gives the same winners in the same order as
+    playing the game, with and without NumPy.
+
+    """
+    if use_numpy and solution.np is None:
+        pytest.skip("NumPy is not installed.")
+    if not use_numpy:
+        monkeypatch.setattr(solution, "np", None)
+
+    boards, numbers = parse_input(ROOT.joinpath("data", filename))
+    expected = list(get_winning_scores(boards, numbers))
+    ranking = rank_boards(boards, numbers)
+    assert len(ranking) == len(boards)
+    assert list(ranking.winning_scores()) == expected
+    assert ranking.first() == expected[0]
+    assert ranking.last() == expected[-1]
+
+
+def test_ranked_scores_unfinished():
+    """Test that boards which never win are left out of the ranking."""
+    boards, numbers = parse_input(ROOT.joinpath("data", "test_input_1.txt"))
+    ranking = rank_boards(boards, numbers[:12])
+    assert ranking.order == [2]
+    assert ranking.first() == (boards[2], 4512)
+    with pytest.raises(ValueError):
+        ranking.score(0)
+    with pytest.raises(ValueError):
+        rank_boards(boards, []).last()
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+@pytest.mark.parametrize("filename", ["test_input_1.txt", "input_1.txt"])
+def test_board_set_scores(monkeypatch, use_numpy: bool, filename: str):
+    """
+    Test that playing with a set of boards gives the same winners in the same
+    order, with and without NumPy.
+
+    """
+    if use_numpy and solution.np is None:
+        pytest.skip("NumPy is not installed.")
+    if not use_numpy:
+        monkeypatch.setattr(solution, "np", None)
+
+    path = ROOT.joinpath("data", filename)
+    boards, numbers = parse_input(path)
+    board_set, compact_numbers = parse_input(path, compact=True)
+    assert isinstance(board_set, BingoBoardSet)
+    assert list(compact_numbers) == numbers
+    assert len(board_set) == len(boards)
+    assert [board_set.grid(index) for index in range(len(boards))] == [
+        board.grid for board in boards
+    ]
+
+    expected = [
+        (boards.index(board), score)
+        for board, score in get_winning_scores(boards, numbers)
+    ]
+    assert list(board_set.winning_scores(numbers)) == expected
+
+    ranking = rank_boards(board_set, numbers)
+    assert [(index, ranking.score(index)) for index in ranking.order] == expected
+
+
+def test_board_set_marking():
+    """Test marking numbers on a set of boards."""
+    board_set, _ = parse_input(ROOT.joinpath("data", "test_input_1.txt"), compact=True)
+    assert board_set.mark(22) == board_set.cells.count(22)
+    assert board_set.mark(99) == 0
+    for number in (13, 17, 11, 0):
+        board_set.mark(number)
+    assert board_set.winners() == [0]
+    assert board_set.unmarked_sum(0) == sum(board_set.cells[:25]) - 63
+
+    with pytest.raises(IndexError):
+        board_set.grid(3)
+    with pytest.raises(ValueError):
+        BingoBoardSet(board_set.cells[:24])
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_evaluate_sequences(max_workers: int):
+    """
+    Test that the first and last winners are found for several sequences of
+    numbers, in worker processes sharing the boards.
+
+    """
+    path = ROOT.joinpath("data", "input_1.txt")
+    boards, numbers = parse_input(path)
+    board_set, _ = parse_input(path, compact=True)
+
+    sequences = [numbers, numbers[:5]]
+    for seed in range(4):
+        shuffled = list(numbers)
+        random.Random(seed).shuffle(shuffled)
+        sequences.append(shuffled)
+
+    results = evaluate_sequences(board_set, sequences, max_workers, chunk_size=2)
+    assert len(results) == len(sequences)
+    assert results[1] == (None, None)
+    del sequences[1], results[1]
+    for sequence, result in zip(sequences, results):
+        expected = [
+            (boards.index(board), score)
+            for board, score in get_winning_scores(boards, sequence)
+        ]
+        assert result == (expected[0], expected[-1])
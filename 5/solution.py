@@ -3,17 +3,116 @@ Solution to the fifth challenge, calculating dangerous points where there
 are overlapping lines of hydrothermal vents.
 
 """
-from collections import Counter
+import sys
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, defaultdict
 from dataclasses import dataclass
 from itertools import repeat
 from os import PathLike
 from pathlib import Path
-from typing import Iterable, Iterator, MutableMapping, Sequence, Tuple
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+sys.path.append(str(Path(__file__).absolute().parents[1]))
+from aoc.fast_input import (  # pylint: disable=wrong-import-position
+    IntArray,
+    read_segments,
+)
+from aoc.instrument import instrument, phase  # pylint: disable=wrong-import-position
 
 ROOT = Path(__file__).absolute().parent
 
 
 Point = Tuple[int, int]
+Segment = Tuple[int, int, int, int]
+"""The coordinates of a line: `start_x`, `start_y`, `end_x`, `end_y`."""
+Bounds = Tuple[int, int, int, int]
+"""A rectangle of points: `min_x`, `min_y`, `max_x`, `max_y` (inclusive)."""
+
+Family = Literal["horizontal", "vertical", "diagonal", "antidiagonal"]
+"""
+A family of parallel lines. Diagonal lines have a constant `x - y`, and
+antidiagonal lines a constant `x + y`.
+"""
+Interval = Tuple[int, int]
+"""An inclusive range of positions along a line."""
+FamilyIntervals = Dict[int, List[Interval]]
+"""Disjoint, sorted intervals along each line in a family (keyed by the line)."""
+
+_FAMILY_COORDINATES: Dict[Family, Callable[[int, int], Tuple[int, int]]] = {
+    "horizontal": lambda x, y: (y, x),
+    "vertical": lambda x, y: (x, y),
+    "diagonal": lambda x, y: (x - y, x),
+    "antidiagonal": lambda x, y: (x + y, x),
+}
+"""
+Functions mapping a point to the line in a family through it (the key) and its
+position along that line.
+"""
+_FAMILY_POINTS: Dict[Family, Callable[[int, int], Point]] = {
+    "horizontal": lambda key, position: (position, key),
+    "vertical": lambda key, position: (key, position),
+    "diagonal": lambda key, position: (position, position - key),
+    "antidiagonal": lambda key, position: (position, key - position),
+}
+"""The inverses of `_FAMILY_COORDINATES`."""
+
+_CROSSING_TRANSFORMS: Dict[
+    Tuple[Family, Family],
+    Tuple[Callable[[int, int], Point], Callable[[int, int], Optional[Point]]],
+] = {
+    ("horizontal", "vertical"): (
+        lambda x, y: (x, y),
+        lambda a, b: (a, b),
+    ),
+    ("horizontal", "diagonal"): (
+        lambda x, y: (x - y, y),
+        lambda a, b: (a + b, b),
+    ),
+    ("horizontal", "antidiagonal"): (
+        lambda x, y: (x + y, y),
+        lambda a, b: (a - b, b),
+    ),
+    ("vertical", "diagonal"): (
+        lambda x, y: (x - y, x),
+        lambda a, b: (b, b - a),
+    ),
+    ("vertical", "antidiagonal"): (
+        lambda x, y: (x + y, x),
+        lambda a, b: (b, a - b),
+    ),
+    ("diagonal", "antidiagonal"): (
+        lambda x, y: (x + y, x - y),
+        lambda a, b: ((a + b) // 2, (a - b) // 2) if (a - b) % 2 == 0 else None,
+    ),
+}
+"""
+For each pair of families, a transform of points to coordinates (`a`, `b`) in
+which the lines of the first family are horizontal (constant `b`) and the lines
+of the second are vertical (constant `a`), and its inverse. Diagonal and
+antidiagonal lines only cross at a point if `a` and `b` have the same parity.
+"""
+
+_SATURATING_INCREMENT = bytes(min(count + 1, 2) for count in range(256))
+"""A translation table adding one to a count of lines, up to a maximum of 2."""
 
 
 @dataclass(frozen=True)
@@ -67,21 +166,286 @@ class Line:
         return cls(start, end)  # type: ignore
 
 
-def parse_input(path: PathLike) -> Sequence[Line]:
+def parse_input(
+    path: PathLike, compact: bool = False
+) -> Union[Sequence[Line], IntArray]:
     """
     Parse the hydrothermal vent data, returning a sequence of `Line`s.
 
+    If `compact` is True, return the coordinates of the lines as a flat
+    `array` instead, with four values (`start_x`, `start_y`, `end_x`, `end_y`)
+    per line.
+
+    """
+    coordinates = read_segments(path)
+    if compact:
+        return coordinates
+
+    values = iter(coordinates)
+    return [Line((x_1, y_1), (x_2, y_2)) for x_1, y_1, x_2, y_2 in zip(*[values] * 4)]
+
+
+def _iterate_segments(lines: Union[Iterable[Line], IntArray]) -> Iterator[Segment]:
+    """Iterate through the coordinates of lines, or a flat array of them."""
+    if isinstance(lines, array):
+        values = iter(lines)
+        return zip(values, values, values, values)
+    return ((*line.start, *line.end) for line in lines)  # type: ignore
+
+
+def _select_segments(
+    lines: Union[Iterable[Line], IntArray], aligned_only: bool
+) -> IntArray:
+    """
+    Get the coordinates of the lines as a flat array, leaving out diagonal
+    lines if `aligned_only` is True.
+
+    """
+    selected = array("q")
+    for x_1, y_1, x_2, y_2 in _iterate_segments(lines):
+        if x_1 == x_2 or y_1 == y_2:
+            selected.extend((x_1, y_1, x_2, y_2))
+        elif abs(x_2 - x_1) != abs(y_2 - y_1):
+            raise ValueError("Lines must be horizontal, vertical or diagonal.")
+        elif not aligned_only:
+            selected.extend((x_1, y_1, x_2, y_2))
+    return selected
+
+
+def _get_bounds(segments: IntArray) -> Bounds:
+    """Get the bounds of the points on a number of lines."""
+    x_values, y_values = segments[0::2], segments[1::2]
+    return min(x_values), min(y_values), max(x_values), max(y_values)
+
+
+def _rasterize(segments: IntArray, bounds: Bounds) -> int:
+    """
+    Draw lines onto a dense grid covering `bounds`, counting the number of
+    lines through each point (up to a maximum of 2), and count the points where
+    at least two lines overlap.
+
+    The grid is stored row by row, so every line (horizontal, vertical or
+    diagonal) is a slice of the grid with a constant step, and is drawn with a
+    single slice assignment.
+
+    """
+    min_x, min_y, max_x, max_y = bounds
+    width = max_x - min_x + 1
+    grid = (
+        np.zeros(width * (max_y - min_y + 1), dtype=np.uint8)
+        if np is not None
+        else bytearray(width * (max_y - min_y + 1))
+    )
+
+    values = iter(segments)
+    for x_1, y_1, x_2, y_2 in zip(values, values, values, values):
+        start = (y_1 - min_y) * width + x_1 - min_x
+        end = (y_2 - min_y) * width + x_2 - min_x
+        start, end = min(start, end), max(start, end)
+        n_steps = max(abs(x_2 - x_1), abs(y_2 - y_1))
+        points = slice(start, end + 1, (end - start) // n_steps if n_steps else 1)
+
+        if np is not None:
+            cells = grid[points]
+            cells += cells < 2
+        else:
+            grid[points] = grid[points].translate(_SATURATING_INCREMENT)
+
+    if np is not None:
+        return int(np.count_nonzero(grid == 2))
+    return grid.count(2)
+
+
+def _count_overlaps_dense(
+    lines: Union[Iterable[Line], IntArray], aligned_only: bool
+) -> int:
+    """
+    Count the points where lines overlap by drawing them onto a dense grid
+    covering the bounds of the lines (one byte per point).
+
     """
-    with open(path, "r", encoding="utf-8") as file:
-        return list(map(Line.from_entry, file))
+    segments = _select_segments(lines, aligned_only)
+    if not segments:
+        return 0
+    return _rasterize(segments, _get_bounds(segments))
+
 
+def _get_family(segment: Segment) -> Family:
+    """Get the family of a (horizontal, vertical or diagonal) line."""
+    x_1, y_1, x_2, y_2 = segment
+    if y_1 == y_2:
+        return "horizontal"
+    if x_1 == x_2:
+        return "vertical"
+    return "diagonal" if x_2 - x_1 == y_2 - y_1 else "antidiagonal"
+
+
+def _merge_intervals(
+    intervals: List[Interval],
+) -> Tuple[List[Interval], List[Interval]]:
+    """
+    Merge the intervals along a line, returning the (disjoint, sorted)
+    intervals covered by at least one of them and by at least two of them.
 
-def calculate_line_overlap(lines: Iterable[Line], aligned_only: bool = True) -> int:
+    """
+    covered: List[Interval] = []
+    overlapping: List[Interval] = []
+    for start, end in sorted(intervals):
+        if covered and start <= covered[-1][1]:
+            last_start, last_end = covered[-1]
+            overlap = (start, min(end, last_end))
+            if overlapping and overlap[0] <= overlapping[-1][1] + 1:
+                previous_start, previous_end = overlapping.pop()
+                overlap = (previous_start, max(overlap[1], previous_end))
+            overlapping.append(overlap)
+            covered[-1] = (last_start, max(end, last_end))
+        elif covered and start == covered[-1][1] + 1:
+            covered[-1] = (covered[-1][0], end)
+        else:
+            covered.append((start, end))
+    return covered, overlapping
+
+
+def _sweep_crossings(
+    horizontal: List[Tuple[int, int, int]], vertical: List[Tuple[int, int, int]]
+) -> Iterator[Point]:
+    """
+    Find the points (`a`, `b`) where horizontal lines (`b`, `start_a`, `end_a`)
+    cross vertical lines (`a`, `start_b`, `end_b`), sweeping across `a`. The
+    horizontal lines at each `b` must be disjoint.
+
+    The lines being crossed are kept sorted by `b`, so the crossings with each
+    vertical line are found with a binary search.
+
+    """
+    events = [(start, 0, b, b) for b, start, _ in horizontal]
+    events.extend((a, 1, start, end) for a, start, end in vertical)
+    events.extend((end, 2, b, b) for b, _, end in horizontal)
+    events.sort()
+
+    active: List[int] = []
+    for a, kind, start, end in events:
+        if kind == 0:
+            insort(active, start)
+        elif kind == 2:
+            del active[bisect_left(active, start)]
+        else:
+            first, last = bisect_left(active, start), bisect_right(active, end)
+            for b in active[first:last]:
+                yield a, b
+
+
+def _in_intervals(family_intervals: FamilyIntervals, key: int, position: int) -> bool:
+    """Whether a position along a line is within the intervals along that line."""
+    line_intervals = family_intervals.get(key)
+    if not line_intervals:
+        return False
+    index = bisect_right(line_intervals, (position, float("inf"))) - 1
+    return index >= 0 and line_intervals[index][1] >= position
+
+
+def _count_overlaps_sweep(
+    lines: Union[Iterable[Line], IntArray], aligned_only: bool
+) -> int:
+    """
+    Count the points where lines overlap analytically, without visiting the
+    points along each line.
+
+    The lines are split into families of parallel lines. Within each family,
+    the intervals along each line are merged, counting the points covered
+    more than once. The points where lines of different families cross are
+    then found with a sweep over each pair of families, and are counted unless
+    they were already counted within a family.
+
+    """
+    intervals: Dict[Family, FamilyIntervals] = defaultdict(lambda: defaultdict(list))
+    values = _select_segments(lines, aligned_only)
+    for x_1, y_1, x_2, y_2 in _iterate_segments(values):
+        family = _get_family((x_1, y_1, x_2, y_2))
+        key, start = _FAMILY_COORDINATES[family](x_1, y_1)
+        _, end = _FAMILY_COORDINATES[family](x_2, y_2)
+        intervals[family][key].append((min(start, end), max(start, end)))
+
+    covered: Dict[Family, FamilyIntervals] = {}
+    overlapping: Dict[Family, FamilyIntervals] = {}
+    n_overlaps = 0
+    for family, family_intervals in intervals.items():
+        covered[family], overlapping[family] = {}, {}
+        for key, line_intervals in family_intervals.items():
+            line_covered, line_overlapping = _merge_intervals(line_intervals)
+            covered[family][key] = line_covered
+            if line_overlapping:
+                overlapping[family][key] = line_overlapping
+                n_overlaps += sum(end - start + 1 for start, end in line_overlapping)
+
+    crossings: Set[Point] = set()
+    for (first, second), (to_crossing, from_crossing) in _CROSSING_TRANSFORMS.items():
+        if first not in covered or second not in covered:
+            continue
+
+        horizontal, vertical = [], []
+        for family, transformed in ((first, horizontal), (second, vertical)):
+            to_point = _FAMILY_POINTS[family]
+            for key, line_covered in covered[family].items():
+                for start, end in line_covered:
+                    a_1, b_1 = to_crossing(*to_point(key, start))
+                    a_2, b_2 = to_crossing(*to_point(key, end))
+                    if family == first:
+                        transformed.append((b_1, min(a_1, a_2), max(a_1, a_2)))
+                    else:
+                        transformed.append((a_1, min(b_1, b_2), max(b_1, b_2)))
+
+        for a, b in _sweep_crossings(horizontal, vertical):
+            point = from_crossing(a, b)
+            if point is not None:
+                crossings.add(point)
+
+    # Crossings are counted once, whether or not they were counted within
+    # families (possibly more than one).
+    for point in crossings:
+        n_counted = sum(
+            _in_intervals(overlapping[family], *_FAMILY_COORDINATES[family](*point))
+            for family in overlapping
+        )
+        n_overlaps += 1 - n_counted if n_counted else 1
+
+    return n_overlaps
+
+
+@instrument
+def calculate_line_overlap(
+    lines: Union[Iterable[Line], IntArray],
+    aligned_only: bool = True,
+    engine: Literal["counter", "dense", "sweep"] = "counter",
+) -> int:
     """
     Calculate the number of overlapping lines. If `aligned_only` is True, consider
     only lines which are aligned to the X or Y axes.
 
+    By default, the lines through each point are counted with a `Counter`. If
+    `engine` is `"dense"`, the lines are drawn onto a dense grid instead (with
+    NumPy, where it's available). If `engine` is `"sweep"`, the overlaps are
+    found analytically, in a time which depends on the number of lines and the
+    points where they cross rather than their length. Both of these require
+    lines to be horizontal, vertical or diagonal.
+
+    The `lines` can also be given as a flat array of coordinates (from
+    `parse_input(path, compact=True)`).
+
     """
+    if engine == "dense":
+        return _count_overlaps_dense(lines, aligned_only)
+    if engine == "sweep":
+        return _count_overlaps_sweep(lines, aligned_only)
+    if engine != "counter":
+        raise ValueError("`engine` must be one of `{'counter', 'dense', 'sweep'}`")
+
+    if isinstance(lines, array):
+        lines = [
+            Line((x_1, y_1), (x_2, y_2))
+            for x_1, y_1, x_2, y_2 in _iterate_segments(lines)
+        ]
+
     point_counter: MutableMapping[Point, int] = Counter()
 
     for line in lines:
@@ -99,14 +463,18 @@ def calculate_line_overlap(lines: Iterable[Line], aligned_only: bool = True) ->
     return n_overlapping
 
 
-def main():
+def main(path: PathLike = ROOT.joinpath("data", "input_1.txt")):
     """Read in the data and calculate the number of dangerous positions."""
-    lines = parse_input(ROOT.joinpath("data", "input_1.txt"))
+    with phase("parse") as parsing:
+        lines = parse_input(path)
+        parsing.add_items(len(lines))
 
-    n_aligned_overlaps = calculate_line_overlap(lines)
+    with phase("part_1", items=len(lines)):
+        n_aligned_overlaps = calculate_line_overlap(lines)
     print(f"{n_aligned_overlaps} overlapping line(s) of X/Y aligned vents.")
 
-    n_overlaps = calculate_line_overlap(lines, aligned_only=False)
+    with phase("part_2", items=len(lines)):
+        n_overlaps = calculate_line_overlap(lines, aligned_only=False)
     print(f"{n_overlaps} overlapping line(s) of vents.")
 
 
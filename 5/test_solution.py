@@ -1,7 +1,10 @@
 """Tests using AOC-provided example data."""
 from pathlib import Path
 
-from solution import parse_input, calculate_line_overlap
+import pytest
+
+import solution
+from solution import Line, parse_input, calculate_line_overlap
 
 ROOT = Path(__file__).absolute().parent
 
@@ -23,3 +26,90 @@ def test_line_overlap_calc():
     """
     lines = parse_input(ROOT.joinpath("data", "test_input_1.txt"))
     assert calculate_line_overlap(lines, aligned_only=False) == 12
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+@pytest.mark.parametrize("compact", [True, False])
+@pytest.mark.parametrize("aligned_only", [True, False])
+def test_dense_line_overlap_calc(
+    monkeypatch, use_numpy: bool, compact: bool, aligned_only: bool
+):
+    """
+    Test that drawing the lines onto a dense grid gives the same number of
+    overlaps, with and without NumPy.
+
+    """
+    if use_numpy and solution.np is None:
+        pytest.skip("NumPy is not installed.")
+    if not use_numpy:
+        monkeypatch.setattr(solution, "np", None)
+
+    for filename in ("test_input_1.txt", "input_1.txt"):
+        path = ROOT.joinpath("data", filename)
+        expected = calculate_line_overlap(parse_input(path), aligned_only)
+        lines = parse_input(path, compact=compact)
+        assert calculate_line_overlap(lines, aligned_only, engine="dense") == expected
+
+
+def test_dense_line_overlap_edge_cases():
+    """Test drawing negative coordinates, single points and no lines at all."""
+    lines = [
+        Line((-3, -3), (0, 0)),
+        Line((2, -1), (-2, 3)),
+        Line((0, 3), (0, -5)),
+    ]
+    for aligned_only in (True, False):
+        expected = calculate_line_overlap(lines, aligned_only)
+        assert calculate_line_overlap(lines, aligned_only, engine="dense") == expected
+    assert calculate_line_overlap([], engine="dense") == 0
+
+    point = Line((-3, -3), (-3, -3))
+    assert calculate_line_overlap([point, *lines], False, engine="dense") == 3
+
+    with pytest.raises(ValueError):
+        calculate_line_overlap([Line((0, 0), (1, 2))], engine="dense")
+    with pytest.raises(ValueError):
+        calculate_line_overlap(lines, engine="grid")
+
+
+@pytest.mark.parametrize("compact", [True, False])
+@pytest.mark.parametrize("aligned_only", [True, False])
+def test_sweep_line_overlap_calc(compact: bool, aligned_only: bool):
+    """Test that finding the overlaps analytically gives the same number."""
+    for filename in ("test_input_1.txt", "input_1.txt"):
+        path = ROOT.joinpath("data", filename)
+        expected = calculate_line_overlap(parse_input(path), aligned_only)
+        lines = parse_input(path, compact=compact)
+        assert calculate_line_overlap(lines, aligned_only, engine="sweep") == expected
+
+
+def test_sweep_line_overlap_edge_cases():
+    """
+    Test finding the overlaps analytically where overlapping lines of different
+    families cross, where several families cross at a point, and where the
+    coordinates are too large for a dense grid.
+
+    """
+    lines = [
+        Line((824, 561), (686, 561)),
+        Line((256, 561), (746, 561)),
+        Line((722, 484), (722, 837)),
+        Line((722, 612), (722, 290)),
+        Line((700, 539), (750, 589)),
+        Line((700, 583), (750, 533)),
+        Line((1, 1), (1, 1)),
+    ]
+    for aligned_only in (True, False):
+        expected = calculate_line_overlap(lines, aligned_only)
+        assert calculate_line_overlap(lines, aligned_only, engine="sweep") == expected
+
+    scale = 10 ** 9
+    lines = [
+        Line((-scale, 0), (scale, 0)),
+        Line((0, -scale), (0, scale)),
+        Line((-scale, -scale), (scale, scale)),
+        Line((-scale + 1, scale), (scale, -scale + 1)),
+        Line((5, 0), (scale, 0)),
+    ]
+    assert calculate_line_overlap(lines, engine="sweep") == scale - 4
+    assert calculate_line_overlap(lines, False, engine="sweep") == scale - 3
@@ -3,11 +3,18 @@ Solution to the sixth challenge, calculating the proliferation of
 lanternfish.
 
 """
+import sys
 from collections import Counter
 from os import PathLike
 from pathlib import Path
 from typing import Sequence, Iterable
 
+sys.path.append(str(Path(__file__).absolute().parents[1]))
+from aoc.fast_input import (  # pylint: disable=wrong-import-position
+    read_comma_ints,
+)
+from aoc.instrument import instrument, phase  # pylint: disable=wrong-import-position
+
 ROOT = Path(__file__).absolute().parent
 
 
@@ -15,12 +22,17 @@ LanternFish = int
 """A lanternfish, represented by the number of days until spawn."""
 
 
-def parse_input(path: PathLike) -> Sequence[LanternFish]:
-    """Read in a sequence of lanternfish from a file."""
-    with open(path, "r", encoding="utf-8") as file:
-        return list(map(int, next(file).rstrip().split(",")))
+def parse_input(path: PathLike, compact: bool = False) -> Sequence[LanternFish]:
+    """
+    Read in a sequence of lanternfish from a file. If `compact` is True,
+    return the lanternfish as an `array` of integers rather than a list.
+
+    """
+    all_lanternfish = read_comma_ints(path)
+    return all_lanternfish if compact else all_lanternfish.tolist()
 
 
+@instrument
 def count_lanternfish_after(lanternfish: Iterable[LanternFish], n_days: int) -> int:
     """Count the number of lanternfish after a given number of days."""
     fish_counter = Counter(lanternfish)
@@ -37,14 +49,18 @@ def count_lanternfish_after(lanternfish: Iterable[LanternFish], n_days: int) ->
     return sum(fish_counter.values())
 
 
-def main():
+def main(path: PathLike = ROOT.joinpath("data", "input_1.txt")):
     """Perform the lanternfish population analysis."""
-    all_lanternfish = parse_input(ROOT.joinpath("data", "input_1.txt"))
+    with phase("parse") as parsing:
+        all_lanternfish = parse_input(path)
+        parsing.add_items(len(all_lanternfish))
 
-    n_lanternfish = count_lanternfish_after(all_lanternfish, n_days=80)
+    with phase("part_1", items=80):
+        n_lanternfish = count_lanternfish_after(all_lanternfish, n_days=80)
     print(f"{n_lanternfish} fish after 80 days.")
 
-    n_lanternfish = count_lanternfish_after(all_lanternfish, n_days=256)
+    with phase("part_2", items=256):
+        n_lanternfish = count_lanternfish_after(all_lanternfish, n_days=256)
     print(f"{n_lanternfish} fish after 256 days.")
 
 
@@ -2,10 +2,18 @@
 Solution to the seventh challenge, aligning crab submarines.
 
 """
+import sys
 from functools import partial
 from os import PathLike
 from pathlib import Path
-from typing import Callable, List, Literal
+from typing import Callable, List, Literal, Union
+
+sys.path.append(str(Path(__file__).absolute().parents[1]))
+from aoc.fast_input import (  # pylint: disable=wrong-import-position
+    IntArray,
+    read_comma_ints,
+)
+from aoc.instrument import instrument, phase  # pylint: disable=wrong-import-position
 
 ROOT = Path(__file__).absolute().parent
 
@@ -17,12 +25,19 @@ FuelCost = int
 """The cost, in units of fuel, of a move."""
 
 
-def parse_input(path: PathLike) -> List[Position]:
-    """Return a sequence of horizontal positions of the crab subs."""
-    with open(path, "r", encoding="utf-8") as file:
-        return list(map(int, next(file).rstrip().split(",")))
+def parse_input(
+    path: PathLike, compact: bool = False
+) -> Union[List[Position], IntArray]:
+    """
+    Return a sequence of horizontal positions of the crab subs. If `compact`
+    is True, return the positions as an `array` of integers rather than a list.
+
+    """
+    crab_positions = read_comma_ints(path)
+    return crab_positions if compact else crab_positions.tolist()
 
 
+@instrument
 def get_fuel_usage(
     crab_positions: List[Position],
     proposed_position: Position,
@@ -32,6 +47,7 @@ def get_fuel_usage(
     return sum([fuel_cost_func(pos, proposed_position) for pos in crab_positions])
 
 
+@instrument
 def get_min_fuel_usage(
     crab_positions: List[Position],
     fuel_burn: Literal["constant", "increasing"] = "constant",
@@ -76,14 +92,18 @@ def get_min_fuel_usage(
             return fuel_usage
 
 
-def main():
+def main(path: PathLike = ROOT.joinpath("data", "input_1.txt")):
     """Calculate the minimum crab fuel usage."""
-    crab_positions = parse_input(ROOT.joinpath("data", "input_1.txt"))
+    with phase("parse") as parsing:
+        crab_positions = parse_input(path)
+        parsing.add_items(len(crab_positions))
 
-    min_usage = get_min_fuel_usage(crab_positions)
+    with phase("part_1", items=len(crab_positions)):
+        min_usage = get_min_fuel_usage(crab_positions)
     print(f"Minimum crab fuel use (with constant burn) is {min_usage} units.")
 
-    min_usage = get_min_fuel_usage(crab_positions, "increasing")
+    with phase("part_2", items=len(crab_positions)):
+        min_usage = get_min_fuel_usage(crab_positions, "increasing")
     print(f"Minimum crab fuel use (with increasing burn) is {min_usage} units.")
 
 
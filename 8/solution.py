@@ -3,10 +3,14 @@ Solution to the eighth challenge, parsing mangled seven segment
 displays.
 
 """
+import sys
 from os import PathLike
 from pathlib import Path
 from typing import List, MutableMapping, Set, Tuple
 
+sys.path.append(str(Path(__file__).absolute().parents[1]))
+from aoc.instrument import instrument, phase  # pylint: disable=wrong-import-position
+
 ROOT = Path(__file__).absolute().parent
 
 
@@ -59,6 +63,7 @@ class Display:  # pylint: disable=too-few-public-methods
 
     """
 
+    @instrument
     def __init__(self, input_signals: InputSignals):
         digit_sets: List[Set[Segment]] = list(map(set, input_signals))  # type: ignore
 
@@ -97,6 +102,7 @@ class Display:  # pylint: disable=too-few-public-methods
 
         self._mapping = {frozenset(digit): value for value, digit in mapping.items()}
 
+    @instrument
     def render(self, display_digits: List[SegmentString]) -> int:
         """Render a display value, returning it as an integer."""
 
@@ -152,18 +158,25 @@ def parse_input(path: PathLike) -> List[Tuple[Display, DisplayDigits]]:
         return data
 
 
-def main():
+def main(path: PathLike = ROOT.joinpath("data", "input_1.txt")):
     """
     Count the number of 1s, 4s, 7s, and 8s in the output, and sum the
     output values.
 
     """
-    input_data = parse_input(ROOT.joinpath("data", "input_1.txt"))
-
-    total, count_simple = 0, 0
-    for display, display_digits in input_data:
-        count_simple += display.count_unambiguous(display_digits)
-        total += display.render(display_digits)
+    with phase("parse") as parsing:
+        input_data = parse_input(path)
+        parsing.add_items(len(input_data))
+
+    with phase("part_1", items=len(input_data)):
+        count_simple = sum(
+            display.count_unambiguous(display_digits)
+            for display, display_digits in input_data
+        )
+    with phase("part_2", items=len(input_data)):
+        total = sum(
+            display.render(display_digits) for display, display_digits in input_data
+        )
 
     print(f"1, 4, 7 and 8 occur {count_simple} times in output.")
     print(f"The sum of the output values is {total}.")
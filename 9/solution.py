@@ -3,12 +3,20 @@ Solution to the ninth challenge, calculating risk from hydrothermal
 vents.
 
 """
+import sys
 from functools import reduce
 from itertools import chain, tee
 from operator import mul
 from os import PathLike
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar, Union
+
+sys.path.append(str(Path(__file__).absolute().parents[1]))
+from aoc.fast_input import (  # pylint: disable=wrong-import-position
+    DigitGrid,
+    read_digit_grid,
+)
+from aoc.instrument import instrument, phase  # pylint: disable=wrong-import-position
 
 ROOT = Path(__file__).absolute().parent
 
@@ -30,10 +38,14 @@ Basin = Set[Position]
 """A basin within the surface of the cave."""
 
 
-def parse_input(path: PathLike) -> HeightMap:
-    """Scan the input, returning a height map."""
-    with open(path, "r", encoding="utf-8") as file:
-        return list(map(lambda line: list(map(int, line.rstrip())), file))
+def parse_input(path: PathLike, compact: bool = False) -> Union[HeightMap, DigitGrid]:
+    """
+    Scan the input, returning a height map. If `compact` is True, return the
+    height map as a `DigitGrid`, with one byte per position.
+
+    """
+    grid = read_digit_grid(path)
+    return grid if compact else grid.to_lists()
 
 
 def sandwich_iterator(
@@ -62,6 +74,7 @@ def sandwich_iterator(
         yield tup
 
 
+@instrument
 def get_depressions(height_map: HeightMap) -> Dict[Position, Height]:
     """Calculate the depressions within a height map."""
     depressions = {}
@@ -117,6 +130,7 @@ def get_adjacent_positions(
     return positions
 
 
+@instrument
 def get_basin(
     height_map: HeightMap,
     depression: Position,
@@ -138,6 +152,7 @@ def get_basin(
     return basin
 
 
+@instrument
 def calculate_risk_level_basins(height_map: HeightMap, depressions: Dict[Position, Height]) -> int:
     """
     Calculate the risk level of a height map based on the three
@@ -149,15 +164,19 @@ def calculate_risk_level_basins(height_map: HeightMap, depressions: Dict[Positio
     return reduce(mul, basin_sizes[0:3], 1)
 
 
-def main():
+def main(path: PathLike = ROOT.joinpath("data", "input_1.txt")):
     """Scan the height map for danger."""
-    height_map = parse_input(ROOT.joinpath("data", "input_1.txt"))
-    depressions = get_depressions(height_map)
+    with phase("parse") as parsing:
+        height_map = parse_input(path)
+        parsing.add_items(len(height_map))
 
-    risk_level = calculate_risk_level_positional(depressions)
+    with phase("part_1"):
+        depressions = get_depressions(height_map)
+        risk_level = calculate_risk_level_positional(depressions)
     print(f"The risk level is {risk_level} based on single positions.")
 
-    risk_level = calculate_risk_level_basins(height_map, depressions)
+    with phase("part_2", items=len(depressions)):
+        risk_level = calculate_risk_level_basins(height_map, depressions)
     print(f"The risk level is {risk_level} based on basins.")
 
 
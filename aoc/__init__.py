@@ -0,0 +1,5 @@
+"""
+Shared tooling for the Advent of Code solutions, used for running and
+benchmarking the solutions for each day.
+
+"""
@@ -0,0 +1,561 @@
+"""
+Benchmarks for the solution to each day, using synthetic inputs generated at
+a range of sizes.
+
+The size of each input is given as a scale, which is a multiple of the size
+of the bundled puzzle input. Parsing and solving are timed separately, and
+the results can be written as JSON so that they can be compared between
+commits:
+
+```
+python -m aoc.benchmark --days 1 5 --scales 1 10 100 --output bench.json
+```
+
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from itertools import islice
+from math import ceil, sqrt
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from aoc.days import ROOT, Day, discover_days, load_solution
+
+Scale = int
+"""The size of a generated input, as a multiple of the bundled input size."""
+
+InputGenerator = Callable[[Scale, random.Random], str]
+"""A function which generates the text of an input file at a given scale."""
+
+Parser = Callable[[ModuleType, Path], Any]
+"""A function which parses an input file using a solution module."""
+
+Solver = Callable[[ModuleType, Any], Any]
+"""A function which solves both parts of the puzzle from the parsed input."""
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """The functions required to benchmark a day's solution."""
+
+    generate: InputGenerator
+    """Generate an input file for the day."""
+    solve: Solver
+    """Solve both parts of the puzzle, given the parsed input."""
+    parse: Parser = lambda module, path: module.parse_input(path)
+    """Parse the input file. By default, this uses the module's `parse_input`."""
+
+
+@dataclass
+class BenchmarkResult:  # pylint: disable=too-many-instance-attributes
+    """The result of benchmarking a day's solution at a given scale."""
+
+    day: Day
+    scale: Scale
+    n_bytes: int
+    """The size of the generated input, in bytes."""
+    n_lines: int
+    """The number of lines in the generated input."""
+    parse_seconds: Optional[float] = None
+    """The fastest time taken to parse the input."""
+    solve_seconds: Optional[float] = None
+    """The fastest time taken to solve both parts from the parsed input."""
+    parse_peak_bytes: Optional[int] = None
+    """The peak memory allocated while parsing, as measured by `tracemalloc`."""
+    solve_peak_bytes: Optional[int] = None
+    """The peak memory allocated while solving, as measured by `tracemalloc`."""
+    error: Optional[str] = None
+    """The error raised by the solution, if it failed."""
+    throughput: Dict[str, Optional[float]] = field(default_factory=dict)
+    """Lines and bytes processed per second, for each phase."""
+
+    def __post_init__(self):
+        for phase in ("parse", "solve"):
+            seconds = getattr(self, f"{phase}_seconds")
+            for unit, amount in (("lines", self.n_lines), ("bytes", self.n_bytes)):
+                rate = amount / seconds if seconds else None
+                self.throughput[f"{phase}_{unit}_per_second"] = rate
+
+
+def _generate_depths(scale: Scale, rng: random.Random) -> str:
+    depth, depths = 100, []
+    for _ in range(2000 * scale):
+        depth = max(depth + rng.randint(-10, 15), 0)
+        depths.append(f"{depth}\n")
+    return "".join(depths)
+
+
+def _generate_movements(scale: Scale, rng: random.Random) -> str:
+    directions = ("forward", "down", "up")
+    return "".join(
+        f"{rng.choice(directions)} {rng.randint(1, 9)}\n" for _ in range(1000 * scale)
+    )
+
+
+def _generate_diagnostics(scale: Scale, rng: random.Random) -> str:
+    # Every reading of the given width is present once (in a random order), so
+    # the search for the life support ratings never narrows to readings which
+    # all share the next bit.
+    width = max(12, (1000 * scale - 1).bit_length())
+    readings = rng.sample(range(2 ** width), 2 ** width)
+    return "".join(f"{reading:0{width}b}\n" for reading in readings)
+
+
+def _generate_bingo(scale: Scale, rng: random.Random) -> str:
+    numbers = list(range(100))
+    rng.shuffle(numbers)
+    sections = [",".join(map(str, numbers)) + "\n"]
+
+    for _ in range(100 * scale):
+        cells = rng.sample(range(100), 25)
+        rows = (cells[index : index + 5] for index in range(0, 25, 5))
+        board = "".join(" ".join(f"{num:2d}" for num in row) + "\n" for row in rows)
+        sections.append(board)
+
+    return "\n".join(sections)
+
+
+def _generate_vents(scale: Scale, rng: random.Random) -> str:
+    bound = 1000 * ceil(sqrt(scale))
+    max_length = bound // 3
+
+    lines = []
+    for _ in range(500 * scale):
+        start_x, start_y = rng.randrange(bound), rng.randrange(bound)
+        length = rng.randint(1, max_length)
+        step_x, step_y = rng.choice([(1, 0), (0, 1), (1, 1), (1, -1)])
+        end_x = min(max(start_x + step_x * length, 0), bound - 1)
+        end_y = min(max(start_y + step_y * length, 0), bound - 1)
+        if step_x and step_y:
+            # Keep diagonals at 45 degrees after clamping to the bounds.
+            length = min(abs(end_x - start_x), abs(end_y - start_y))
+            end_x, end_y = start_x + step_x * length, start_y + step_y * length
+        lines.append(f"{start_x},{start_y} -> {end_x},{end_y}\n")
+
+    return "".join(lines)
+
+
+def _generate_timers(scale: Scale, rng: random.Random) -> str:
+    return ",".join(str(rng.randint(1, 5)) for _ in range(300 * scale)) + "\n"
+
+
+def _generate_crabs(scale: Scale, rng: random.Random) -> str:
+    return ",".join(str(rng.randint(0, 2000)) for _ in range(1000 * scale)) + "\n"
+
+
+_DIGIT_SEGMENTS = (
+    "abcefg",
+    "cf",
+    "acdeg",
+    "acdfg",
+    "bcdf",
+    "abdfg",
+    "abdefg",
+    "acf",
+    "abcdefg",
+    "abcdfg",
+)
+
+
+def _generate_displays(scale: Scale, rng: random.Random) -> str:
+    entries = []
+    for _ in range(200 * scale):
+        wiring = dict(zip("abcdefg", rng.sample("abcdefg", 7)))
+        digits = [
+            "".join(rng.sample([wiring[seg] for seg in segments], len(segments)))
+            for segments in _DIGIT_SEGMENTS
+        ]
+        signals = rng.sample(digits, len(digits))
+        outputs = [rng.choice(digits) for _ in range(4)]
+        entries.append(f"{' '.join(signals)} | {' '.join(outputs)}\n")
+
+    return "".join(entries)
+
+
+def _generate_height_map(scale: Scale, rng: random.Random) -> str:
+    # Walls of 9s keep the basins (and the recursion used to find them) small.
+    side = 100 * ceil(sqrt(scale))
+    rows = []
+    for y_pos in range(side):
+        row = (
+            "9" if y_pos % 8 == 7 or x_pos % 8 == 7 else str(rng.randint(0, 8))
+            for x_pos in range(side)
+        )
+        rows.append("".join(row) + "\n")
+
+    return "".join(rows)
+
+
+_BRACKETS = {"(": ")", "[": "]", "{": "}", "<": ">"}
+
+
+def _generate_brackets(scale: Scale, rng: random.Random) -> str:
+    lines = []
+    for line_index in range(100 * scale):
+        corrupt = line_index % 2 == 0
+        length = rng.randint(80, 110)
+        chars: List[str] = []
+        stack: List[str] = []
+
+        for char_index in range(length):
+            if stack and (rng.random() < 0.45 or char_index == length - 1):
+                expected = _BRACKETS[stack.pop()]
+                if corrupt and char_index > length // 2:
+                    wrong = [char for char in _BRACKETS.values() if char != expected]
+                    chars.append(rng.choice(wrong))
+                    corrupt = False
+                else:
+                    chars.append(expected)
+            else:
+                stack.append(rng.choice(list(_BRACKETS)))
+                chars.append(stack[-1])
+
+        if not stack:
+            chars.append(rng.choice(list(_BRACKETS)))
+        lines.append("".join(chars) + "\n")
+
+    return "".join(lines)
+
+
+def _generate_octopi(scale: Scale, rng: random.Random) -> str:
+    side = 10 * ceil(sqrt(scale))
+    return "".join(
+        "".join(str(rng.randint(0, 9)) for _ in range(side)) + "\n" for _ in range(side)
+    )
+
+
+def _generate_caves(scale: Scale, rng: random.Random) -> str:
+    # Parallel branches keep the number of paths linear in the number of caves.
+    edges = []
+    for index in range(8 * scale):
+        edges.extend([f"start-b{index}", f"b{index}-end", f"b{index}-c{index}"])
+    rng.shuffle(edges)
+    return "\n".join(edges) + "\n"
+
+
+_FOLDS = (
+    ("x", 655),
+    ("y", 447),
+    ("x", 327),
+    ("y", 223),
+    ("x", 163),
+    ("y", 111),
+    ("x", 81),
+    ("y", 55),
+    ("x", 40),
+    ("y", 27),
+    ("y", 13),
+    ("y", 6),
+)
+
+
+def _generate_sheet(scale: Scale, rng: random.Random) -> str:
+    marks = "".join(
+        f"{rng.randrange(1311)},{rng.randrange(895)}\n" for _ in range(900 * scale)
+    )
+    folds = "".join(f"fold along {axis}={position}\n" for axis, position in _FOLDS)
+    return f"{marks}\n{folds}"
+
+
+def _generate_polymer(scale: Scale, rng: random.Random) -> str:
+    elements = "BCFHKNOPSV"
+    template = "".join(rng.choice(elements) for _ in range(20 * scale))
+    rules = "".join(
+        f"{first}{last} -> {rng.choice(elements)}\n"
+        for first in elements
+        for last in elements
+    )
+    return f"{template}\n\n{rules}"
+
+
+def _solve_day_4(module: ModuleType, parsed: Any) -> Any:
+    boards, numbers = parsed
+    scores = list(module.get_winning_scores(boards, numbers))
+    return scores[0][1], scores[-1][1]
+
+
+def _solve_day_8(module: ModuleType, parsed: Any) -> Any:
+    # pylint: disable=unused-argument
+    count_simple = sum(display.count_unambiguous(digits) for display, digits in parsed)
+    total = sum(display.render(digits) for display, digits in parsed)
+    return count_simple, total
+
+
+def _solve_day_9(module: ModuleType, parsed: Any) -> Any:
+    depressions = module.get_depressions(parsed)
+    return (
+        module.calculate_risk_level_positional(depressions),
+        module.calculate_risk_level_basins(parsed, depressions),
+    )
+
+
+def _solve_day_10(module: ModuleType, parsed: Any) -> Any:
+    mismatches, completions = zip(*map(module.identify_bracket_errors, parsed))
+    return (
+        module.score_mismatches(filter(None, mismatches)),
+        module.score_completions(filter(None, completions)),
+    )
+
+
+def _solve_day_12(module: ModuleType, parsed: Any) -> Any:
+    # pylint: disable=unused-argument
+    return (
+        sum(1 for _ in parsed.enumerate_paths()),
+        sum(1 for _ in parsed.enumerate_paths(True)),
+    )
+
+
+def _solve_day_13(module: ModuleType, parsed: Any) -> Any:
+    # pylint: disable=unused-argument
+    sheet, folds = parsed
+    sheet = sheet.fold(*folds[0])
+    n_marks = sheet.count_marks()
+    for fold in folds[1:]:
+        sheet = sheet.fold(*fold)
+    return n_marks, str(sheet)
+
+
+def _solve_day_14(module: ModuleType, parsed: Any) -> Any:
+    element_counts = list(islice(module.polymerise(*parsed), 40))
+    return element_counts[9].most_common(), element_counts[-1].most_common()
+
+
+CASES: Dict[Day, BenchmarkCase] = {
+    1: BenchmarkCase(
+        _generate_depths,
+        lambda module, parsed: (
+            module.count_increases_pairwise(parsed),
+            module.count_increases_window(parsed),
+        ),
+    ),
+    2: BenchmarkCase(
+        _generate_movements,
+        lambda module, parsed: (
+            module.calculate_distance(parsed),
+            module.calculate_distance(parsed, read_manual=True),
+        ),
+    ),
+    3: BenchmarkCase(
+        _generate_diagnostics,
+        lambda module, parsed: (
+            module.get_power_consumption(parsed[0]),
+            module.get_life_support_rating(parsed[1]),
+        ),
+        lambda module, path: (
+            module.parse_power_input(path),
+            module.parse_diagnostic_input(path),
+        ),
+    ),
+    4: BenchmarkCase(_generate_bingo, _solve_day_4),
+    5: BenchmarkCase(
+        _generate_vents,
+        lambda module, parsed: (
+            module.calculate_line_overlap(parsed),
+            module.calculate_line_overlap(parsed, aligned_only=False),
+        ),
+    ),
+    6: BenchmarkCase(
+        _generate_timers,
+        lambda module, parsed: (
+            module.count_lanternfish_after(parsed, n_days=80),
+            module.count_lanternfish_after(parsed, n_days=256),
+        ),
+    ),
+    7: BenchmarkCase(
+        _generate_crabs,
+        lambda module, parsed: (
+            module.get_min_fuel_usage(parsed),
+            module.get_min_fuel_usage(parsed, "increasing"),
+        ),
+    ),
+    8: BenchmarkCase(_generate_displays, _solve_day_8),
+    9: BenchmarkCase(_generate_height_map, _solve_day_9),
+    10: BenchmarkCase(_generate_brackets, _solve_day_10),
+    11: BenchmarkCase(
+        _generate_octopi,
+        lambda module, parsed: sum(islice(module.iterate_flashes(parsed), 100)),
+    ),
+    12: BenchmarkCase(_generate_caves, _solve_day_12),
+    13: BenchmarkCase(_generate_sheet, _solve_day_13),
+    14: BenchmarkCase(_generate_polymer, _solve_day_14),
+}
+"""The benchmark cases for each day."""
+
+
+def _run_phases(
+    case: BenchmarkCase, module: ModuleType, path: Path
+) -> Sequence[float]:
+    """Parse and solve an input, returning the time taken for each phase."""
+    start = time.perf_counter()
+    parsed = case.parse(module, path)
+    parsed_at = time.perf_counter()
+    case.solve(module, parsed)
+    solved_at = time.perf_counter()
+
+    return parsed_at - start, solved_at - parsed_at
+
+
+def _measure_peak_memory(
+    case: BenchmarkCase, module: ModuleType, path: Path
+) -> Sequence[int]:
+    """Parse and solve an input, returning the peak allocations for each phase."""
+    tracemalloc.start()
+    try:
+        parsed = case.parse(module, path)
+        _, parse_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        case.solve(module, parsed)
+        _, solve_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return parse_peak, solve_peak
+
+
+def benchmark_day(
+    day: Day,
+    scale: Scale,
+    repeat: int = 1,
+    seed: int = 0,
+    measure_memory: bool = True,
+) -> BenchmarkResult:
+    """
+    Benchmark a day's solution at a given scale, taking the fastest time for
+    each phase over `repeat` runs. Peak memory is measured in a separate run, as
+    tracing allocations slows the solutions down.
+
+    """
+    case = CASES[day]
+    module = load_solution(day)
+    text = case.generate(scale, random.Random(f"{seed}-{day}-{scale}"))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory, f"input_{day}_{scale}.txt")
+        path.write_text(text, encoding="utf-8")
+        n_bytes, n_lines = path.stat().st_size, text.count("\n")
+
+        try:
+            timings = [_run_phases(case, module, path) for _ in range(repeat)]
+            parse_seconds, solve_seconds = map(min, zip(*timings))
+            peaks = _measure_peak_memory(case, module, path) if measure_memory else None
+        except Exception as err:  # pylint: disable=broad-except
+            error = f"{type(err).__name__}: {err}"
+            return BenchmarkResult(day, scale, n_bytes, n_lines, error=error)
+
+    parse_peak, solve_peak = peaks if peaks is not None else (None, None)
+    return BenchmarkResult(
+        day,
+        scale,
+        n_bytes,
+        n_lines,
+        parse_seconds,
+        solve_seconds,
+        parse_peak,
+        solve_peak,
+    )
+
+
+def run_benchmarks(
+    days: Iterable[Day],
+    scales: Iterable[Scale],
+    repeat: int = 1,
+    seed: int = 0,
+    measure_memory: bool = True,
+) -> List[BenchmarkResult]:
+    """Benchmark each of the days at each of the scales."""
+    scales = list(scales)
+    return [
+        benchmark_day(day, scale, repeat, seed, measure_memory)
+        for day in days
+        for scale in scales
+    ]
+
+
+def _get_commit() -> Optional[str]:
+    """Get the current commit of the repository, if possible."""
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def _format_result(result: BenchmarkResult) -> str:
+    """Format a benchmark result as a row in a table."""
+    prefix = f"{result.day:>3} {result.scale:>6} {result.n_lines:>10}"
+    if result.error is not None:
+        return f"{prefix}  failed: {result.error}"
+
+    def format_peak(n_bytes: Optional[int]) -> str:
+        return "-" if n_bytes is None else f"{n_bytes / 2 ** 20:.1f}"
+
+    lines_per_second = result.throughput["parse_lines_per_second"]
+    return (
+        f"{prefix} {result.parse_seconds:>10.4f} {result.solve_seconds:>10.4f} "
+        + f"{lines_per_second or 0:>12.0f} "
+        + f"{format_peak(result.parse_peak_bytes):>10} "
+        + f"{format_peak(result.solve_peak_bytes):>10}"
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Run the benchmarks from the command line."""
+    available_days = [day for day in discover_days() if day in CASES]
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "--days", nargs="+", type=int, default=available_days, choices=available_days
+    )
+    parser.add_argument("--scales", nargs="+", type=int, default=[1])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc")
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    args = parser.parse_args(argv)
+
+    header = (
+        f"{'day':>3} {'scale':>6} {'lines':>10} {'parse (s)':>10} {'solve (s)':>10} "
+        + f"{'parse ln/s':>12} {'parse MiB':>10} {'solve MiB':>10}"
+    )
+    print(header)
+
+    results = []
+    for day in args.days:
+        for scale in args.scales:
+            result = benchmark_day(
+                day, scale, args.repeat, args.seed, not args.no_memory
+            )
+            print(_format_result(result), flush=True)
+            results.append(result)
+
+    if args.output is not None:
+        report = {
+            "commit": _get_commit(),
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "results": [asdict(result) for result in results],
+        }
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
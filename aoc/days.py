@@ -0,0 +1,61 @@
+"""
+Discovery and loading of the solution modules for each day.
+
+"""
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import List
+
+ROOT = Path(__file__).absolute().parents[1]
+"""The root of the repository, containing a directory for each day."""
+
+Day = int
+"""The number of the day (and the name of the directory containing the solution)."""
+
+
+def get_solution_path(day: Day) -> Path:
+    """Get the path to the solution module for a given day."""
+    return ROOT.joinpath(str(day), "solution.py")
+
+
+def discover_days() -> List[Day]:
+    """Return the days which have a solution, in order."""
+    days = []
+    for path in ROOT.iterdir():
+        if path.name.isdigit() and path.joinpath("solution.py").is_file():
+            days.append(int(path.name))
+
+    return sorted(days)
+
+
+def load_solution(day: Day) -> ModuleType:
+    """
+    Import the solution module for a given day. The module is registered as
+    `day_{day}_solution`, as each module is named `solution`.
+
+    """
+    module_name = f"day_{day}_solution"
+    try:
+        return sys.modules[module_name]
+    except KeyError:
+        pass
+
+    path = get_solution_path(day)
+    if not path.is_file():
+        raise ValueError(f"No solution for day {day} (expected {path}).")
+
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Unable to load solution from {path}.")
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+
+    return module
@@ -0,0 +1,174 @@
+"""
+Fast parsing of the common input formats into compact buffers.
+
+Input files are memory-mapped and parsed in large, line-aligned blocks rather
+than line by line, so that no intermediate `str` is created for each line.
+Integers are returned in an `array` (eight bytes per value, rather than a
+Python `int` object per value) and grids of digits are returned as `bytes`.
+
+"""
+import mmap
+import re
+from array import array
+from contextlib import contextmanager
+from os import PathLike
+from typing import Iterator, List, NamedTuple, Tuple, Union
+
+BLOCK_SIZE = 2 ** 24
+"""The approximate number of bytes parsed at a time."""
+
+INTEGER_PATTERN = re.compile(rb"-?[0-9]+")
+"""A pattern matching a (possibly negative) integer."""
+
+_DIGIT_TABLE = bytes(
+    char - ord("0") if ord("0") <= char <= ord("9") else 255 for char in range(256)
+)
+"""A translation table from ASCII digits to their values (other bytes to 255)."""
+
+Buffer = Union[bytes, mmap.mmap]
+"""The contents of a file, either memory-mapped or (if empty) as `bytes`."""
+
+IntArray = array
+"""An `array` of signed 64-bit integers (typecode `'q'`)."""
+
+
+class DigitGrid(NamedTuple):
+    """
+    A rectangular grid of single digits. Cells are stored row by row, with one
+    byte per cell holding the value of the digit.
+
+    """
+
+    cells: bytes
+    """The value of each cell, in row-major order."""
+    width: int
+    """The number of cells in each row."""
+    height: int
+    """The number of rows."""
+
+    def row(self, index: int) -> memoryview:
+        """Get a (zero-copy) view of a row in the grid."""
+        if not 0 <= index < self.height:
+            raise IndexError("Row index out of range")
+        start = index * self.width
+        return memoryview(self.cells)[start : start + self.width]
+
+    def to_lists(self) -> List[List[int]]:
+        """Convert the grid to a list of lists (rows) of integers."""
+        width = self.width
+        return [
+            list(self.cells[start : start + width])
+            for start in range(0, len(self.cells), width)
+        ]
+
+
+@contextmanager
+def map_input(path: PathLike) -> Iterator[Buffer]:
+    """
+    Memory-map a file for reading. Empty files (which can't be mapped) are
+    returned as an empty `bytes` object.
+
+    """
+    with open(path, "rb") as file:
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            yield b""
+            return
+
+        with buffer:
+            yield buffer
+
+
+def iterate_blocks(
+    buffer: Buffer, start: int = 0, end: int = -1, size: int = 0
+) -> Iterator[slice]:
+    """
+    Iterate through a buffer in blocks of roughly `size` bytes (by default,
+    `BLOCK_SIZE`), yielding slices which end at a line break (or the end of the
+    range). If `end` is negative, continue to the end of the buffer.
+
+    """
+    end = len(buffer) if end < 0 else end
+    size = size or BLOCK_SIZE
+    while start < end:
+        stop = buffer.find(b"\n", min(start + size, end), end)
+        stop = end if stop == -1 else stop + 1
+        yield slice(start, stop)
+        start = stop
+
+
+def _parse_ints(buffer: Buffer, start: int = 0, end: int = -1) -> IntArray:
+    """Parse all the integers between `start` and `end` in the buffer."""
+    values = array("q")
+    for block in iterate_blocks(buffer, start, end):
+        tokens = INTEGER_PATTERN.findall(buffer, block.start, block.stop)
+        values.extend(map(int, tokens))
+    return values
+
+
+def read_line_ints(path: PathLike, start: int = 0, end: int = -1) -> IntArray:
+    """
+    Read a file containing one integer per line. If `start` or `end` are given,
+    read only the integers in that range of bytes (if `end` is negative,
+    continue to the end of the file).
+
+    """
+    with map_input(path) as buffer:
+        return _parse_ints(buffer, start, end)
+
+
+def split_lines(path: PathLike, chunk_size: int) -> List[Tuple[int, int]]:
+    """
+    Split a file into ranges of bytes (`start`, `end`) of roughly `chunk_size`
+    bytes, each of which starts at the beginning of a line.
+
+    """
+    with map_input(path) as buffer:
+        blocks = iterate_blocks(buffer, size=chunk_size)
+        return [(block.start, block.stop) for block in blocks]
+
+
+def read_comma_ints(path: PathLike) -> IntArray:
+    """Read a sequence of comma-separated integers from the first line of a file."""
+    with map_input(path) as buffer:
+        return _parse_ints(buffer, 0, buffer.find(b"\n"))
+
+
+def read_digit_grid(path: PathLike) -> DigitGrid:
+    """
+    Read a rectangular grid of digits, with one row per line and no separators
+    between digits.
+
+    """
+    with map_input(path) as buffer:
+        width = buffer.find(b"\n")
+        width = len(buffer) if width == -1 else width
+        if width and buffer[width - 1 : width] == b"\r":
+            width -= 1
+
+        blocks = [
+            buffer[block].translate(_DIGIT_TABLE, b"\r\n")
+            for block in iterate_blocks(buffer)
+        ]
+
+    cells = b"".join(blocks)
+    if 255 in cells:
+        raise ValueError("Grid contains characters which are not digits.")
+    if not width or len(cells) % width:
+        raise ValueError("Grid is not rectangular.")
+
+    return DigitGrid(cells, width, len(cells) // width)
+
+
+def read_segments(path: PathLike) -> IntArray:
+    """
+    Read a file of line segments in the form `x1,y1 -> x2,y2`, with one
+    segment per line. The coordinates are returned as a flat array, with four
+    values (`x1`, `y1`, `x2`, `y2`) per segment.
+
+    """
+    values = read_line_ints(path)
+    if len(values) % 4:
+        raise ValueError("Segments must each have four coordinates.")
+    return values
@@ -0,0 +1,288 @@
+"""
+Optional instrumentation of the solutions, recording the wall time, number of
+calls, net memory allocated and number of items processed for each phase of a
+run (parsing, and each part of the puzzle) and the functions called within it.
+
+Instrumentation is enabled by setting the `AOC_PROFILE` environment variable
+(or passing `--profile` to the runner). When `AOC_PROFILE` is `time`, memory
+allocations are not traced (which is much faster); any other non-empty value
+traces them with `tracemalloc`. Running a solution directly with instrumentation
+enabled writes the report to `AOC_PROFILE_OUTPUT` (or standard error) on exit:
+
+```
+AOC_PROFILE=1 AOC_PROFILE_OUTPUT=profile.folded python 5/solution.py
+```
+
+Reports are written as JSON or, if the output path doesn't end in `.json`, as
+collapsed stacks which can be used to produce a flame graph.
+
+Functions are only wrapped by `instrument` if instrumentation is enabled when
+they are defined, so there is no cost to leaving it disabled.
+
+"""
+import atexit
+import inspect
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from functools import wraps
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    TypeVar,
+)
+
+ENV_VAR = "AOC_PROFILE"
+"""The environment variable used to enable instrumentation."""
+
+OUTPUT_ENV_VAR = "AOC_PROFILE_OUTPUT"
+"""The environment variable giving the path the report is written to on exit."""
+
+FuncType = TypeVar("FuncType", bound=Callable[..., Any])
+
+Stack = Tuple[str, ...]
+"""The names of a phase and the phases it was entered from, outermost first."""
+
+
+@dataclass
+class PhaseRecord:
+    """The measurements recorded for a phase, from a given stack."""
+
+    calls: int = 0
+    """The number of times the phase was entered (including recursive calls)."""
+    seconds: float = 0.0
+    """The total wall time spent in the phase."""
+    allocated_bytes: int = 0
+    """The net memory allocated in the phase (if allocations are traced)."""
+    items: int = 0
+    """The number of items processed (or yielded) in the phase."""
+
+
+_ENABLED = bool(os.environ.get(ENV_VAR))
+_TRACE_ALLOCATIONS = _ENABLED and os.environ[ENV_VAR] != "time"
+_RECORDS: Dict[Stack, PhaseRecord] = {}
+_STACK: List[str] = []
+
+
+class Phase:
+    """A context manager which records measurements for a phase of a run."""
+
+    __slots__ = ("name", "_items", "_count_call", "_record", "_start", "_memory")
+
+    def __init__(self, name: str, items: int = 0, count_call: bool = True):
+        self.name = name
+        self._items = items
+        self._count_call = count_call
+        self._record = PhaseRecord()
+        self._start = 0.0
+        self._memory = 0
+
+    def __enter__(self) -> "Phase":
+        _STACK.append(self.name)
+        self._record = _RECORDS.setdefault(tuple(_STACK), PhaseRecord())
+        self._record.calls += self._count_call
+        if _TRACE_ALLOCATIONS:
+            self._memory = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record = self._record
+        record.seconds += time.perf_counter() - self._start
+        record.items += self._items
+        if _TRACE_ALLOCATIONS:
+            record.allocated_bytes += tracemalloc.get_traced_memory()[0] - self._memory
+        _STACK.pop()
+
+    def add_items(self, n_items: int):
+        """Record a number of items as having been processed in the phase."""
+        self._items += n_items
+
+
+class _NullPhase:
+    """A phase which records nothing, used when instrumentation is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullPhase":
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def add_items(self, n_items: int):
+        """Do nothing."""
+
+
+_NULL_PHASE = _NullPhase()
+
+
+def is_enabled() -> bool:
+    """Whether instrumentation is enabled."""
+    return _ENABLED
+
+
+def enable(trace_allocations: bool = True):
+    """
+    Enable instrumentation. This must be done before the solutions are
+    imported for their functions to be instrumented, and also enables
+    instrumentation in any subprocesses which are started afterwards.
+
+    """
+    global _ENABLED, _TRACE_ALLOCATIONS  # pylint: disable=global-statement
+    _ENABLED, _TRACE_ALLOCATIONS = True, trace_allocations
+    os.environ[ENV_VAR] = "1" if trace_allocations else "time"
+    if trace_allocations and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def reset():
+    """Clear the measurements which have been recorded."""
+    _RECORDS.clear()
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+
+
+def phase(name: str, items: int = 0):
+    """
+    Return a context manager recording a phase of a run (for example, parsing
+    or solving one part of a puzzle), optionally with the number of items it
+    processes.
+
+    """
+    return Phase(name, items) if _ENABLED else _NULL_PHASE
+
+
+def _instrument_generator(name: str, generator: Iterator[Any]) -> Iterator[Any]:
+    """Record each resumption of a generator in a phase, counting the items."""
+    count_call = True
+    try:
+        while True:
+            with Phase(name, count_call=count_call) as resumption:
+                try:
+                    item = next(generator)
+                except StopIteration as stop:
+                    return stop.value
+                resumption.add_items(1)
+            count_call = False
+            yield item
+    finally:
+        generator.close()  # type: ignore
+
+
+def instrument(func: FuncType) -> FuncType:
+    """
+    Record calls to a function as a phase, named after the function. Calls to
+    generator functions are recorded each time the generator is resumed, with
+    each item yielded counted as an item processed. Recursive calls are
+    counted, but timed only by the outermost call.
+
+    If instrumentation is disabled, the function is returned unchanged.
+
+    """
+    if not _ENABLED:
+        return func
+
+    name = func.__qualname__
+
+    if inspect.isgeneratorfunction(func):
+
+        @wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            return _instrument_generator(name, func(*args, **kwargs))
+
+        return generator_wrapper  # type: ignore
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if name in _STACK:
+            stack = tuple(_STACK[: _STACK.index(name) + 1])
+            _RECORDS[stack].calls += 1
+            return func(*args, **kwargs)
+
+        with Phase(name):
+            return func(*args, **kwargs)
+
+    return wrapper  # type: ignore
+
+
+def get_report() -> Dict[str, Any]:
+    """
+    Get a report of the measurements recorded, with the time spent in each
+    phase excluding the phases entered from it (`self_seconds`).
+
+    """
+    child_seconds: Dict[Stack, float] = {}
+    for stack, record in _RECORDS.items():
+        if len(stack) > 1:
+            parent = stack[:-1]
+            child_seconds[parent] = child_seconds.get(parent, 0.0) + record.seconds
+
+    phases = []
+    for stack, record in _RECORDS.items():
+        self_seconds = max(record.seconds - child_seconds.get(stack, 0.0), 0.0)
+        phase_report = {"stack": list(stack), **asdict(record)}
+        phases.append({**phase_report, "self_seconds": self_seconds})
+
+    peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+    return {"phases": phases, "peak_allocated_bytes": peak}
+
+
+def write_collapsed(reports: Dict[str, Dict[str, Any]], file: TextIO):
+    """
+    Write reports as collapsed stacks (one line per stack, with the self time in
+    microseconds), prefixing each stack with the name of its report.
+
+    """
+    for report_name, report in reports.items():
+        for phase_report in report["phases"]:
+            stack = ";".join([report_name, *phase_report["stack"]])
+            file.write(f"{stack} {round(phase_report['self_seconds'] * 1e6)}\n")
+
+
+def write_reports(reports: Dict[str, Dict[str, Any]], path: Optional[Path] = None):
+    """
+    Write named reports to a file (or standard error), as JSON if the path ends
+    in `.json` (or isn't given) and as collapsed stacks otherwise.
+
+    """
+    if path is None:
+        json.dump(reports, sys.stderr, indent=2)
+        sys.stderr.write("\n")
+        return
+
+    with open(path, "w", encoding="utf-8") as file:
+        if path.suffix == ".json":
+            json.dump(reports, file, indent=2)
+            file.write("\n")
+        else:
+            write_collapsed(reports, file)
+
+
+def _write_report_at_exit():
+    """
+    Write the report for this process to `AOC_PROFILE_OUTPUT` (or standard
+    error, if it isn't set). If it is set but empty, the report isn't written.
+
+    """
+    output = os.environ.get(OUTPUT_ENV_VAR)
+    if output == "":
+        return
+    name = Path(sys.argv[0]).parent.name or "main"
+    write_reports({name: get_report()}, Path(output) if output else None)
+
+
+if _ENABLED:
+    if _TRACE_ALLOCATIONS:
+        tracemalloc.start()
+    atexit.register(_write_report_at_exit)
@@ -0,0 +1,190 @@
+"""
+Run the solutions for several days (and/or several input files) in parallel,
+using a pool of worker processes.
+
+Each task is a day, optionally followed by the path to an input file (as
+`day:path`). Days given without a path are run against each of the files
+passed to `--inputs`, or the bundled puzzle input if there are none:
+
+```
+python -m aoc.runner 1 5 7
+python -m aoc.runner 5 --inputs inputs/day_5/*.txt
+python -m aoc.runner 1:depths.txt 6:fish.txt --jobs 8
+```
+
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from aoc import instrument
+from aoc.days import Day, discover_days, get_solution_path, load_solution
+
+Task = Tuple[Day, Path]
+"""A day and the input file to run its solution on."""
+
+
+@dataclass
+class TaskResult:
+    """The result of running a day's solution on an input file."""
+
+    day: Day
+    path: Path
+    seconds: float
+    """The wall time taken to run the solution."""
+    output: str
+    """The output printed by the solution."""
+    error: Optional[str] = None
+    """The error raised by the solution, if it failed."""
+    profile: Optional[Dict[str, Any]] = None
+    """The instrumentation report for the run, if instrumentation is enabled."""
+
+
+def get_default_input(day: Day) -> Path:
+    """Get the path to the bundled puzzle input for a day."""
+    return get_solution_path(day).parent.joinpath("data", "input_1.txt")
+
+
+def run_task(day: Day, path: Path) -> TaskResult:
+    """Run a day's solution on an input file, capturing its output."""
+    output = io.StringIO()
+    error = None
+    instrument.reset()
+
+    start = time.perf_counter()
+    try:
+        module = load_solution(day)
+        with redirect_stdout(output):
+            module.main(path)
+    except Exception as err:  # pylint: disable=broad-except
+        error = f"{type(err).__name__}: {err}"
+    seconds = time.perf_counter() - start
+
+    profile = instrument.get_report() if instrument.is_enabled() else None
+    return TaskResult(day, path, seconds, output.getvalue(), error, profile)
+
+
+def parse_tasks(specs: Sequence[str], inputs: Sequence[Path]) -> List[Task]:
+    """
+    Parse task specifications (`day` or `day:path`) into tasks. Days without a
+    path are paired with each of the `inputs`, or the bundled input if none are
+    given.
+
+    """
+    tasks: List[Task] = []
+    for spec in specs:
+        day_str, separator, path_str = spec.partition(":")
+        try:
+            day = int(day_str)
+        except ValueError as err:
+            raise ValueError(f"Invalid task {spec!r}, expected `day[:path]`") from err
+
+        if separator:
+            tasks.append((day, Path(path_str)))
+        elif inputs:
+            tasks.extend((day, path) for path in inputs)
+        else:
+            tasks.append((day, get_default_input(day)))
+
+    return tasks
+
+
+def run_tasks(
+    tasks: Iterable[Task], jobs: Optional[int] = None
+) -> Iterable[TaskResult]:
+    """
+    Run tasks in a pool of `jobs` worker processes (by default, one per CPU),
+    yielding the results as they complete. If `jobs` is 1, the tasks are run in
+    this process, in order.
+
+    """
+    if jobs == 1:
+        for day, path in tasks:
+            yield run_task(day, path)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures: Dict[Future, Task] = {
+            executor.submit(run_task, day, path): (day, path) for day, path in tasks
+        }
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _format_result(result: TaskResult) -> str:
+    """Format the result of a task, with its output."""
+    status = "failed" if result.error is not None else "done"
+    lines = [f"== Day {result.day} ({result.path}): {status} in {result.seconds:.3f}s"]
+    lines.extend(result.output.rstrip("\n").split("\n") if result.output else [])
+    if result.error is not None:
+        lines.append(result.error)
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the solutions from the command line, returning the exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "tasks", nargs="*", metavar="day[:path]", help="by default, all days"
+    )
+    parser.add_argument("--inputs", nargs="+", type=Path, default=[])
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="PATH",
+        help="instrument the solutions, writing a report (JSON or collapsed stacks)",
+    )
+    parser.add_argument(
+        "--profile-time-only",
+        action="store_true",
+        help="don't trace memory allocations when instrumenting",
+    )
+    args = parser.parse_args(argv)
+
+    if args.profile is not None:
+        # Reports are collected from each task, rather than written on exit.
+        os.environ[instrument.OUTPUT_ENV_VAR] = ""
+        instrument.enable(trace_allocations=not args.profile_time_only)
+
+    specs = args.tasks or list(map(str, discover_days()))
+    try:
+        tasks = parse_tasks(specs, args.inputs)
+    except ValueError as err:
+        parser.error(str(err))
+
+    start = time.perf_counter()
+    results = []
+    for result in run_tasks(tasks, args.jobs):
+        print(_format_result(result), flush=True)
+        results.append(result)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{'day':>3} {'seconds':>10}  input")
+    for result in sorted(results, key=lambda result: (result.day, str(result.path))):
+        flag = "  (failed)" if result.error is not None else ""
+        print(f"{result.day:>3} {result.seconds:>10.3f}  {result.path}{flag}")
+
+    total = sum(result.seconds for result in results)
+    print(f"Ran {len(results)} task(s) in {elapsed:.3f}s ({total:.3f}s of work).")
+
+    if args.profile is not None:
+        reports = {
+            f"day_{result.day}:{result.path}": result.profile
+            for result in results
+            if result.profile is not None
+        }
+        instrument.write_reports(reports, args.profile)
+
+    return int(any(result.error is not None for result in results))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
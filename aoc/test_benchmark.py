@@ -0,0 +1,20 @@
+"""Tests for the benchmarks, using small synthetic inputs."""
+import pytest
+
+from aoc.benchmark import CASES, benchmark_day
+from aoc.days import discover_days
+
+
+def test_all_days_have_cases():
+    """Test that there is a benchmark case for every day with a solution."""
+    assert set(discover_days()) <= set(CASES)
+
+
+@pytest.mark.parametrize("day", sorted(CASES))
+def test_benchmark_day(day: int):
+    """Test that each day can be benchmarked on a generated input."""
+    result = benchmark_day(day, scale=1)
+    assert result.error is None
+    assert result.n_lines > 0
+    assert result.parse_seconds is not None and result.solve_seconds is not None
+    assert result.solve_peak_bytes is not None and result.solve_peak_bytes > 0
@@ -0,0 +1,55 @@
+"""Tests for the fast parsing of the common input formats."""
+from pathlib import Path
+
+import pytest
+
+from aoc import fast_input
+from aoc.fast_input import (
+    read_comma_ints,
+    read_digit_grid,
+    read_line_ints,
+    read_segments,
+)
+
+ROOT = Path(__file__).absolute().parents[1]
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 2 ** 24])
+def test_read_line_ints(monkeypatch, block_size: int):
+    """Test that integers are read correctly, regardless of block size."""
+    monkeypatch.setattr(fast_input, "BLOCK_SIZE", block_size)
+    path = ROOT.joinpath("1", "data", "test_input_1.txt")
+    expected = [int(line) for line in path.read_text().split()]
+    assert read_line_ints(path).tolist() == expected
+
+
+def test_read_comma_ints(tmp_path: Path):
+    """Test that only the first line of comma-separated integers is read."""
+    path = tmp_path.joinpath("input.txt")
+    path.write_text("3,4,3,1,2\n\n5,6\n")
+    assert read_comma_ints(path).tolist() == [3, 4, 3, 1, 2]
+
+    path.write_text("16,1,2")
+    assert read_comma_ints(path).tolist() == [16, 1, 2]
+
+
+def test_read_digit_grid(tmp_path: Path):
+    """Test that grids of digits are read and validated."""
+    path = tmp_path.joinpath("input.txt")
+    path.write_text("219\r\n398\r\n")
+    grid = read_digit_grid(path)
+    assert (grid.width, grid.height) == (3, 2)
+    assert bytes(grid.row(1)) == bytes([3, 9, 8])
+    assert grid.to_lists() == [[2, 1, 9], [3, 9, 8]]
+
+    path.write_text("219\n39\n")
+    with pytest.raises(ValueError):
+        read_digit_grid(path)
+
+
+def test_read_segments():
+    """Test that line segments are read as flat coordinates."""
+    path = ROOT.joinpath("5", "data", "test_input_1.txt")
+    segments = read_segments(path)
+    assert len(segments) == 40
+    assert segments[:4].tolist() == [0, 9, 5, 9]
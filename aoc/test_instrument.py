@@ -0,0 +1,66 @@
+"""Tests for the instrumentation of the solutions."""
+import io
+
+import pytest
+
+from aoc import instrument
+
+
+@pytest.fixture(name="enabled")
+def fixture_enabled(monkeypatch):
+    """Enable instrumentation (without tracing allocations) for a test."""
+    monkeypatch.setattr(instrument, "_ENABLED", True)
+    monkeypatch.setattr(instrument, "_TRACE_ALLOCATIONS", False)
+    instrument.reset()
+    yield
+    instrument.reset()
+
+
+def test_disabled_is_free():
+    """Test that nothing is wrapped or recorded when disabled."""
+
+    def func():
+        return 1
+
+    assert not instrument.is_enabled()
+    assert instrument.instrument(func) is func
+    with instrument.phase("parse", items=3) as parsing:
+        parsing.add_items(1)
+    assert not instrument.get_report()["phases"]
+
+
+@pytest.mark.usefixtures("enabled")
+def test_phases_and_functions():
+    """Test that phases, calls, recursion and generators are recorded."""
+
+    @instrument.instrument
+    def countdown(number: int) -> int:
+        return number if number == 0 else countdown(number - 1)
+
+    @instrument.instrument
+    def generate(number: int):
+        yield from range(number)
+
+    with instrument.phase("part_1", items=5):
+        countdown(4)
+    with instrument.phase("part_2"):
+        assert list(generate(3)) == [0, 1, 2]
+
+    records = {
+        tuple(record["stack"]): record for record in instrument.get_report()["phases"]
+    }
+    assert records[("part_1",)]["items"] == 5
+    assert records[("part_1", "test_phases_and_functions.<locals>.countdown")][
+        "calls"
+    ] == 5
+
+    generator_record = records[
+        ("part_2", "test_phases_and_functions.<locals>.generate")
+    ]
+    assert (generator_record["calls"], generator_record["items"]) == (1, 3)
+    parent_record = records[("part_2",)]
+    assert parent_record["self_seconds"] <= parent_record["seconds"]
+
+    output = io.StringIO()
+    instrument.write_collapsed({"day_1": instrument.get_report()}, output)
+    assert output.getvalue().startswith("day_1;part_1 ")
@@ -0,0 +1,41 @@
+"""Tests for running the solutions in parallel."""
+from pathlib import Path
+
+import pytest
+
+from aoc.runner import get_default_input, parse_tasks, run_task, run_tasks
+
+ROOT = Path(__file__).absolute().parents[1]
+
+
+def test_parse_tasks():
+    """Test that task specifications are paired with the right inputs."""
+    custom = Path("custom.txt")
+    assert parse_tasks(["1", "6:fish.txt"], []) == [
+        (1, get_default_input(1)),
+        (6, Path("fish.txt")),
+    ]
+    assert parse_tasks(["1", "2"], [custom]) == [(1, custom), (2, custom)]
+
+    with pytest.raises(ValueError):
+        parse_tasks(["one"], [])
+
+
+def test_run_task():
+    """Test that a solution's output is captured, as are any errors."""
+    result = run_task(1, ROOT.joinpath("1", "data", "test_input_1.txt"))
+    assert result.error is None
+    assert "Depth increased 7 times pairwise." in result.output
+
+    result = run_task(1, ROOT.joinpath("1", "data", "missing.txt"))
+    assert result.error is not None and result.error.startswith("FileNotFoundError")
+
+
+def test_run_tasks_parallel():
+    """Test that tasks can be run in a pool of worker processes."""
+    tasks = [
+        (day, ROOT.joinpath(str(day), "data", "test_input_1.txt")) for day in (1, 6)
+    ]
+    results = sorted(run_tasks(tasks, jobs=2), key=lambda result: result.day)
+    assert [result.day for result in results] == [1, 6]
+    assert "5934 fish after 80 days." in results[1].output